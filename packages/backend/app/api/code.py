@@ -1,24 +1,56 @@
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Optional, Any, Dict, List
-from pathlib import Path
-from ..core import node_operations
-from ..core import venv_manager
-from ..core.enhanced_flow_executor import EnhancedFlowExecutor
-import os
+from pathlib import Path
+from ..core import node_operations
+from ..core import request_coalescer
+from ..core import venv_manager
+from ..core import worker_pool
+from ..core.enhanced_flow_executor import EnhancedFlowExecutor
+import ast
+import asyncio
+import functools
+import json
+import orjson
+import os
+import sys
+import traceback
 
 router = APIRouter()
 
+# Bound concurrent node executions so bursts queue instead of oversubscribing
+# the CPU. Sized to the worker pool by default; override via env for bigger hosts.
+_EXEC_SEMAPHORE = asyncio.Semaphore(
+    int(os.getenv("MAX_EXEC_CONCURRENCY", worker_pool.DEFAULT_POOL_SIZE))
+)
+
+# Concurrent execute-node calls for the same (project, node) within a few ms
+# are coalesced into one worker invocation that loops over all their inputs.
+_exec_coalescer = request_coalescer.Coalescer()
+
 # Projects root path
 PROJECTS_ROOT = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "projects")
 
 # Global executor instance for metadata analysis
 metadata_executor = EnhancedFlowExecutor(Path(PROJECTS_ROOT))
 
-class GetNodeCodeRequest(BaseModel):
-    project_id: str
-    node_id: str
-    node_title: Optional[str] = None  # For finding the file if needed
+
+@functools.lru_cache(maxsize=2048)
+def _cached_node_metadata(project_id: str, node_id: str, file_name: str, mtime_ns: int):
+    """Signature analysis memoized per node file version.
+
+    ``mtime_ns`` is part of the key purely to invalidate when the file
+    changes; the frontend polls metadata far more often than code changes.
+    """
+    return metadata_executor.analyze_node_signature(
+        project_id, node_id, {"data": {"file": file_name}}
+    )
+
+class GetNodeCodeRequest(BaseModel):
+    project_id: str
+    node_id: str
+    node_title: Optional[str] = None  # For finding the file if needed
 
 class SaveNodeCodeRequest(BaseModel):
     project_id: str
@@ -30,10 +62,11 @@ class ExecuteNodeRequest(BaseModel):
     project_id: str
     node_id: str
     input_data: Optional[Dict[str, Any]] = None
+    stream: Optional[bool] = False
 
-class PackageInstallRequest(BaseModel):
-    project_id: str
-    package: str
+class PackageInstallRequest(BaseModel):
+    project_id: str
+    package: str
 
 class PackageUninstallRequest(BaseModel):
     project_id: str
@@ -47,8 +80,8 @@ class GetNodeMetadataRequest(BaseModel):
     node_id: str
     node_data: Optional[Dict[str, Any]] = None
 
-@router.post("/getcode")
-async def get_node_code(request: GetNodeCodeRequest):
+@router.post("/getcode")
+async def get_node_code(request: GetNodeCodeRequest):
     """Get the code content of a node for Monaco Editor"""
     try:
         code = node_operations.get_node_code(request.project_id, request.node_id)
@@ -102,103 +135,200 @@ async def save_node_code(request: SaveNodeCodeRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@functools.lru_cache(maxsize=256)
+def _resolve_entrypoint(code: str) -> Optional[str]:
+    """Find the node's entrypoint function name by parsing its AST once.
+
+    Prefers a top-level ``main``; otherwise the first non-underscore
+    top-level function (underscore-prefixed names are private helpers, never
+    entrypoints — matching the runtime reflection this replaces). Returns
+    None when no such function exists (or the code doesn't parse), in which
+    case the wrapper falls back to runtime reflection.
+    """
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return None
+
+    first: Optional[str] = None
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef) and not node.name.startswith("_"):
+            if node.name == "main":
+                return "main"
+            if first is None:
+                first = node.name
+    return first
+
+
+def _project_is_trusted(project_path: Path) -> bool:
+    """Whether a project opted into in-process execution via structure.json."""
+    structure_file = project_path / "structure.json"
+    try:
+        return orjson.loads(structure_file.read_bytes()).get("trusted") is True
+    except (OSError, orjson.JSONDecodeError):
+        return False
+
+
+@functools.lru_cache(maxsize=128)
+def _compiled_node(code: str, filename: str):
+    return compile(code, filename, "exec")
+
+
+def _run_node_inline(
+    code: str, entrypoint_name: Optional[str], inputs: List[Any], filename: str
+) -> List[Dict[str, Any]]:
+    """Execute a node in-process, mirroring the worker's per-input results.
+
+    Only used for trusted projects whose venv python is the server's own
+    interpreter; skips fork/exec, framing, and pipe I/O entirely.
+    """
+    namespace: Dict[str, Any] = {"__name__": "__main__"}
+    try:
+        exec(_compiled_node(code, filename), namespace)
+    except Exception as exc:
+        failure = {
+            "success": False,
+            "error": str(exc),
+            "traceback": traceback.format_exc(),
+        }
+        return [dict(failure) for _ in inputs]
+
+    entrypoint = namespace.get(entrypoint_name or "")
+    if not callable(entrypoint):
+        entrypoint = next(
+            (
+                obj
+                for name, obj in namespace.items()
+                if callable(obj) and not name.startswith("_")
+            ),
+            None,
+        )
+
+    results: List[Dict[str, Any]] = []
+    for input_data in inputs:
+        try:
+            if entrypoint is None:
+                raise RuntimeError("No callable entrypoint found in node code")
+            output = entrypoint(input_data) if input_data is not None else entrypoint()
+            # Probe with json.dumps to accept exactly what the worker path
+            # accepts (e.g. non-string dict keys, which orjson rejects by
+            # default)
+            json.dumps(output)
+
+            results.append({"success": True, "output": output})
+        except Exception as exc:
+            results.append({
+                "success": False,
+                "error": str(exc),
+                "traceback": traceback.format_exc(),
+            })
+    return results
+
+
 @router.post("/execute-node")
 async def execute_single_node(request: ExecuteNodeRequest):
     """Execute a single node and return its output"""
     try:
         # Get the node's code
         code = node_operations.get_node_code(request.project_id, request.node_id)
-        
-        # Create wrapper to execute the node with input data
-        import json
-        input_json_str = json.dumps(request.input_data) if request.input_data else 'null'
-        
-        wrapper_code = f"""
-import json
-import sys
 
-# Node code
-{code}
-
-# Execute with input
-try:
-    input_json = '''{input_json_str}'''
-    if input_json != 'null':
-        input_data = json.loads(input_json)
-    else:
-        input_data = None
-    
-    # Find and execute main function
-    if 'main' in locals() and callable(main):
-        result = main(input_data) if input_data is not None else main()
-    else:
-        # Find first callable
-        result = None
-        for name, obj in list(locals().items()):
-            if callable(obj) and not name.startswith('_') and name not in ['json', 'sys']:
-                result = obj(input_data) if input_data is not None else obj()
-                break
-    
-    print(json.dumps({{'success': True, 'output': result}}))
-except Exception as e:
-    import traceback
-    print(json.dumps({{
-        'success': False,
-        'error': str(e),
-        'traceback': traceback.format_exc()
-    }}))
-"""
-        
-        project_path = Path(PROJECTS_ROOT) / request.project_id
-        if not project_path.exists():
-            raise HTTPException(status_code=404, detail="Project not found")
-
-        try:
-            python_exe = str(venv_manager.python_bin(project_path))
-            exec_env = venv_manager.execution_env(project_path)
-        except venv_manager.VenvError as exc:
-            raise HTTPException(status_code=500, detail=str(exc))
-
-        execution_result = execute_python_code(
-            wrapper_code,
-            timeout=30,
-            python_executable=python_exe,
-            working_dir=str(project_path),
-            env=exec_env,
-        )
-        
-        if execution_result['exit_code'] == 0:
-            try:
-                import json
-                output = json.loads(execution_result['output'])
-                if output.get('success'):
-                    return {
-                        "success": True,
-                        "output": output.get('output'),
-                        "node_id": request.node_id
-                    }
-                else:
-                    return {
-                        "success": False,
-                        "error": output.get('error', 'Unknown error'),
-                        "traceback": output.get('traceback', ''),
-                        "node_id": request.node_id
-                    }
-            except json.JSONDecodeError:
-                return {
+        project_path = Path(PROJECTS_ROOT) / request.project_id
+        if not project_path.exists():
+            raise HTTPException(status_code=404, detail="Project not found")
+
+        try:
+            python_exe = venv_manager.cached_python_bin(project_path)
+            exec_env = venv_manager.cached_execution_env(project_path)
+        except venv_manager.VenvError as exc:
+            raise HTTPException(status_code=500, detail=str(exc))
+
+        if request.stream:
+            # Stream generator output as NDJSON lines; bypasses the coalescer
+            # since each stream occupies its own worker until done
+            async def stream_frames():
+                pool = worker_pool.get_pool(python_exe, str(project_path), env=exec_env)
+                async with _EXEC_SEMAPHORE:
+                    frames = pool.execute_node_stream(
+                        code,
+                        request.input_data,
+                        entrypoint=_resolve_entrypoint(code),
+                        filename=f"{request.node_id}.py",
+                        timeout=30,
+                    )
+                    async for frame in frames:
+                        yield orjson.dumps(frame) + b"\n"
+
+            return StreamingResponse(
+                stream_frames(), media_type="application/x-ndjson"
+            )
+
+        # Trusted projects running the server's own interpreter skip the
+        # worker round-trip and execute in a thread instead
+        use_inline = python_exe == sys.executable and await asyncio.to_thread(
+            _project_is_trusted, project_path
+        )
+
+        async def run_batch(inputs: List[Any]) -> List[Dict[str, Any]]:
+            if use_inline:
+                async with _EXEC_SEMAPHORE:
+                    return await asyncio.to_thread(
+                        _run_node_inline,
+                        code,
+                        _resolve_entrypoint(code),
+                        inputs,
+                        f"{request.node_id}.py",
+                    )
+
+            # Dispatch to a pre-warmed worker process instead of spawning a
+            # fresh interpreter per request (saves fork/exec + startup latency).
+            pool = worker_pool.get_pool(python_exe, str(project_path), env=exec_env)
+            async with _EXEC_SEMAPHORE:
+                execution_result = await pool.execute_node(
+                    code,
+                    inputs,
+                    entrypoint=_resolve_entrypoint(code),
+                    filename=f"{request.node_id}.py",
+                    timeout=30,
+                )
+
+            results = execution_result.get('results')
+            if (
+                execution_result['exit_code'] != 0
+                or not isinstance(results, list)
+                or len(results) != len(inputs)
+            ):
+                failure = {
                     "success": False,
-                    "error": "Failed to parse output",
-                    "output_raw": execution_result['output'],
-                    "node_id": request.node_id
+                    "error": execution_result.get('error') or 'Execution failed',
+                    "output_raw": execution_result.get('output', ''),
                 }
-        else:
+                return [dict(failure) for _ in inputs]
+
+            return results
+
+        node_result = await _exec_coalescer.submit(
+            (request.project_id, request.node_id),
+            request.input_data,
+            run_batch,
+        )
+
+        if node_result.get('success'):
             return {
-                "success": False,
-                "error": execution_result.get('error', 'Execution failed'),
-                "output_raw": execution_result.get('output', ''),
+                "success": True,
+                "output": node_result.get('output'),
                 "node_id": request.node_id
             }
-            
+        response = {
+            "success": False,
+            "error": node_result.get('error', 'Unknown error'),
+            "node_id": request.node_id
+        }
+        if 'traceback' in node_result:
+            response["traceback"] = node_result['traceback']
+        if 'output_raw' in node_result:
+            response["output_raw"] = node_result['output_raw']
+        return response
+
     except ValueError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except Exception as e:
@@ -246,13 +376,28 @@ async def get_node_metadata(request: GetNodeMetadataRequest):
     This includes input parameters, output keys, and mode information.
     """
     try:
-        # Use the enhanced flow executor to analyze the node
-        metadata = metadata_executor.analyze_node_signature(
-            request.project_id,
-            request.node_id,
-            request.node_data or {"data": {}}
+        node_data = request.node_data or {"data": {}}
+
+        # Resolve the node file the same way the executor does, so we can key
+        # the cache on its mtime and skip re-analysis while it's unchanged
+        file_name = node_data.get("data", {}).get("file")
+        if not file_name:
+            title = node_data.get("data", {}).get("title", f"Node_{request.node_id}")
+            sanitized_title = "".join(
+                c if c.isalnum() or c == "_" else "_" for c in title
+            )
+            file_name = f"{request.node_id}_{sanitized_title}.py"
+
+        file_path = Path(PROJECTS_ROOT) / request.project_id / file_name
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = -1
+
+        metadata = _cached_node_metadata(
+            request.project_id, request.node_id, file_name, mtime_ns
         )
-        
+
         return {
             "success": True,
             "project_id": request.project_id,
@@ -271,4 +416,4 @@ async def get_node_metadata(request: GetNodeMetadataRequest):
                 "outputs": [],
                 "error": str(e)
             }
-        }
+        }
@@ -1,30 +1,43 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Optional, List, Dict, Any
-from pathlib import Path
-import json
-import shutil
-
-from app.core import user_components as user_component_service
-
-router = APIRouter()
-
-# Templates directory
-TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates"
-PROJECTS_ROOT = Path(__file__).parent.parent.parent / "projects"
-USER_TEMPLATE_PREFIX = "user:"
-
-# Known template categories within the templates directory
-CATEGORY_FOLDERS = [
-    "flow_control",
-    "params",
-    "inputs",
-    "dataops",
-    "models",
-    "jailbreak",
-    "reports",
-    "annotations",
-]
+from fastapi import APIRouter, HTTPException, Request, Response
+from fastapi.responses import FileResponse, ORJSONResponse
+from pydantic import BaseModel
+from typing import Optional, List, Dict, Any
+from collections import defaultdict
+from pathlib import Path
+import asyncio
+import os
+import re
+import shutil
+
+import aiofiles
+import orjson
+
+from app.core import user_components as user_component_service
+
+# orjson response serialization; the library listing payload grows with the
+# template count
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Templates directory
+TEMPLATES_DIR = Path(__file__).parent.parent.parent / "templates"
+PROJECTS_ROOT = Path(__file__).parent.parent.parent / "projects"
+USER_TEMPLATE_PREFIX = "user:"
+
+# Characters not allowed in node file names (compiled once; runs in C).
+# \W keeps unicode letters/digits like the old isalnum check did.
+_UNSAFE_TITLE_CHARS = re.compile(r"\W")
+
+# Known template categories within the templates directory
+CATEGORY_FOLDERS = [
+    "flow_control",
+    "params",
+    "inputs",
+    "dataops",
+    "models",
+    "jailbreak",
+    "reports",
+    "annotations",
+]
 
 class ComponentTemplate(BaseModel):
     id: str
@@ -46,76 +59,156 @@ class ComponentLibraryResponse(BaseModel):
     success: bool
     templates: List[Dict[str, Any]]
 
+
+# Serializes structure.json read-modify-write per project so concurrent
+# create-from-template calls can't lose each other's updates
+_project_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+# Cached library listing, invalidated when any template directory's mtime changes
+_library_cache_key: Optional[tuple] = None
+_library_cache_templates: List[Dict[str, Any]] = []
+_library_rebuild_lock = asyncio.Lock()
+
+
+def _compute_library_key() -> tuple:
+    """Fingerprint the template directories by mtime for cache invalidation."""
+    entries = []
+    for directory in [TEMPLATES_DIR] + [TEMPLATES_DIR / c for c in CATEGORY_FOLDERS]:
+        try:
+            entries.append((str(directory), directory.stat().st_mtime_ns))
+        except OSError:
+            entries.append((str(directory), -1))
+    return tuple(entries)
+
+
+# Template name -> file index, rebuilt only when a template directory changes
+_template_index_key: Optional[tuple] = None
+_template_index: Dict[str, Path] = {}
+
+
+def _get_template_index() -> Dict[str, Path]:
+    """Map template names (bare and category-qualified) to their files."""
+    global _template_index_key, _template_index
+    key = _compute_library_key()
+    if key != _template_index_key:
+        index: Dict[str, Path] = {}
+        for category in CATEGORY_FOLDERS:
+            category_dir = TEMPLATES_DIR / category
+            if category_dir.exists():
+                for template_file in category_dir.glob("*.py"):
+                    if template_file.name.startswith("__"):
+                        continue
+                    index.setdefault(template_file.stem, template_file)
+                    index[f"{category}/{template_file.stem}"] = template_file
+        if TEMPLATES_DIR.exists():
+            for template_file in TEMPLATES_DIR.glob("*.py"):
+                if not template_file.name.startswith("__"):
+                    index.setdefault(template_file.stem, template_file)
+        _template_index = index
+        _template_index_key = key
+    return _template_index
+
+
+def _load_structure(structure_file: Path) -> Dict[str, Any]:
+    """Read a project's structure.json, defaulting to an empty graph."""
+    if structure_file.exists():
+        return orjson.loads(structure_file.read_bytes())
+    return {"nodes": [], "edges": []}
+
+
+def _save_structure(structure_file: Path, structure: Dict[str, Any]) -> None:
+    structure_file.write_bytes(orjson.dumps(structure, option=orjson.OPT_INDENT_2))
+
 @router.get("/library")
 async def get_component_library():
     """Get list of available component templates"""
+    global _library_cache_key, _library_cache_templates
     try:
-        templates = []
-        
-        # List all template files from category folders
-        if TEMPLATES_DIR.exists():
-            # First, get templates from root (legacy)
-            for template_file in TEMPLATES_DIR.glob("*.py"):
-                if not template_file.name.startswith("__"):
-                    template_name = template_file.stem
-                    
-                    # Read first few lines to get description
-                    with open(template_file, 'r') as f:
-                        lines = f.readlines()
-                        description = ""
-                        for line in lines[:10]:
-                            if line.strip().startswith('"""'):
-                                continue
-                            if '"""' in line:
-                                break
-                            if line.strip():
-                                description = line.strip()
-                                break
-                    
-                    templates.append({
-                        "name": template_name,
-                        "description": description,
-                        "file": template_file.name,
-                        "category": "general"
-                    })
-            
-            # Then, get templates from category folders
-            for category in CATEGORY_FOLDERS:
-                category_dir = TEMPLATES_DIR / category
-                if category_dir.exists():
-                    for template_file in category_dir.glob("*.py"):
-                        if not template_file.name.startswith("__"):
-                            template_name = template_file.stem
-                            
-                            # Read first few lines to get description
-                            with open(template_file, 'r') as f:
-                                lines = f.readlines()
-                                description = ""
-                                for line in lines[:10]:
-                                    if line.strip().startswith('"""'):
-                                        continue
-                                    if '"""' in line:
-                                        break
-                                    if line.strip():
-                                        description = line.strip()
-                                        break
-                            
-                            templates.append({
-                                "name": template_name,
-                                "description": description,
-                                "file": template_file.name,
-                                "category": category,
-                                "path": f"{category}/{template_file.name}"
-                            })
-        
+        # Templates change rarely; skip the directory walk when nothing moved.
+        # The rebuild lock keeps a burst of cold-cache requests from all
+        # re-scanning at once — followers re-check the key after acquiring.
+        cache_key = await asyncio.to_thread(_compute_library_key)
+        if cache_key == _library_cache_key:
+            return {
+                "success": True,
+                "templates": _library_cache_templates
+            }
+
+        async with _library_rebuild_lock:
+            if cache_key == _library_cache_key:
+                return {
+                    "success": True,
+                    "templates": _library_cache_templates
+                }
+
+            templates = await _scan_library()
+            _library_cache_key = cache_key
+            _library_cache_templates = templates
+
         return {
             "success": True,
             "templates": templates
         }
-        
+
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+
+async def _scan_library() -> List[Dict[str, Any]]:
+    """Walk the template directories and assemble the library listing.
+
+    Descriptions are read concurrently — the reads are I/O-bound, so a cold
+    scan overlaps them instead of opening templates one at a time.
+    """
+    entries: List[tuple] = []
+
+    def _is_template(entry: os.DirEntry) -> bool:
+        return (
+            entry.name.endswith(".py")
+            and not entry.name.startswith("__")
+            and entry.is_file(follow_symlinks=False)
+        )
+
+    # os.scandir reuses the type info from the directory read, so each
+    # directory costs one getdents pass instead of exists() + glob stats
+    try:
+        with os.scandir(TEMPLATES_DIR) as it:
+            # First, get templates from root (legacy)
+            for entry in it:
+                if _is_template(entry):
+                    entries.append((Path(entry.path), {
+                        "name": entry.name[:-3],
+                        "file": entry.name,
+                        "category": "general"
+                    }))
+    except FileNotFoundError:
+        return []
+
+    # Then, get templates from category folders
+    for category in CATEGORY_FOLDERS:
+        try:
+            with os.scandir(TEMPLATES_DIR / category) as it:
+                for entry in it:
+                    if _is_template(entry):
+                        entries.append((Path(entry.path), {
+                            "name": entry.name[:-3],
+                            "file": entry.name,
+                            "category": category,
+                            "path": f"{category}/{entry.name}"
+                        }))
+        except FileNotFoundError:
+            continue
+
+    descriptions = await asyncio.gather(
+        *(_read_template_description(path) for path, _ in entries)
+    )
+
+    templates: List[Dict[str, Any]] = []
+    for (_, meta), description in zip(entries, descriptions):
+        meta["description"] = description
+        templates.append(meta)
+    return templates
+
 @router.post("/create-from-template")
 async def create_node_from_template(request: CreateFromTemplateRequest):
     """Create a new node from a component template"""
@@ -125,174 +218,184 @@ async def create_node_from_template(request: CreateFromTemplateRequest):
         if not project_dir.exists():
             raise HTTPException(status_code=404, detail="Project not found")
         
-        template_file: Optional[Path] = None
-        template_base = request.template_name
-        template_source = "builtin"
-        user_template_id: Optional[str] = None
-        stored_metadata: Dict[str, Any] = {}
-
-        if request.template_name.startswith(USER_TEMPLATE_PREFIX):
-            candidate_id = request.template_name[len(USER_TEMPLATE_PREFIX):].strip()
-            if not candidate_id:
-                raise HTTPException(status_code=400, detail="Invalid user template identifier")
-
-            try:
-                user_component = user_component_service.get_user_component(candidate_id)
-            except FileNotFoundError as exc:
-                raise HTTPException(status_code=404, detail=str(exc)) from exc
-
-            template_file = user_component.path / "node.py"
-            if not template_file.exists():
-                raise HTTPException(status_code=404, detail=f"User component '{candidate_id}' is missing node.py")
-
-            template_source = "user"
-            template_base = user_component.name
-            user_template_id = candidate_id
-            stored_metadata = user_component.metadata or {}
-        else:
-            # Check if template_name includes category path first
-            if "/" in request.template_name:
-                potential = TEMPLATES_DIR / f"{request.template_name}.py"
-                if potential.exists():
-                    template_file = potential
-            else:
-                for category in CATEGORY_FOLDERS:
-                    potential_file = TEMPLATES_DIR / category / f"{request.template_name}.py"
-                    if potential_file.exists():
-                        template_file = potential_file
-                        break
-
-                # If not found in categories, check root
-                if not template_file:
-                    potential_file = TEMPLATES_DIR / f"{request.template_name}.py"
-                    if potential_file.exists():
-                        template_file = potential_file
-
-            if not template_file or not template_file.exists():
-                raise HTTPException(status_code=404, detail=f"Template '{request.template_name}' not found")
-
-            template_base = template_file.stem
-
-        # Create node file name
-        sanitized_title = "".join(c if c.isalnum() or c == "_" else "_" for c in request.title)
-        node_file_name = f"{request.node_id}_{sanitized_title}.py"
-        node_file_path = project_dir / node_file_name
-        
-        # Copy template to node file
-        shutil.copy(template_file, node_file_path)
-        
-        # Update structure.json to add the node
-        structure_file = project_dir / "structure.json"
-        if structure_file.exists():
-            with open(structure_file, 'r') as f:
-                structure = json.load(f)
+        template_file: Optional[Path] = None
+        template_base = request.template_name
+        template_source = "builtin"
+        user_template_id: Optional[str] = None
+        stored_metadata: Dict[str, Any] = {}
+
+        if request.template_name.startswith(USER_TEMPLATE_PREFIX):
+            candidate_id = request.template_name[len(USER_TEMPLATE_PREFIX):].strip()
+            if not candidate_id:
+                raise HTTPException(status_code=400, detail="Invalid user template identifier")
+
+            try:
+                user_component = user_component_service.get_user_component(candidate_id)
+            except FileNotFoundError as exc:
+                raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+            template_file = user_component.path / "node.py"
+            if not template_file.exists():
+                raise HTTPException(status_code=404, detail=f"User component '{candidate_id}' is missing node.py")
+
+            template_source = "user"
+            template_base = user_component.name
+            user_template_id = candidate_id
+            stored_metadata = user_component.metadata or {}
         else:
-            structure = {"nodes": [], "edges": []}
+            # O(1) index lookup instead of stat-ing every category folder
+            index = await asyncio.to_thread(_get_template_index)
+            template_file = index.get(request.template_name)
+
+            if not template_file or not template_file.exists():
+                raise HTTPException(status_code=404, detail=f"Template '{request.template_name}' not found")
+
+            template_base = template_file.stem
+
+        # Create node file name
+        sanitized_title = _UNSAFE_TITLE_CHARS.sub("_", request.title)
+        node_file_name = f"{request.node_id}_{sanitized_title}.py"
+        node_file_path = project_dir / node_file_name
         
-        # Determine node type based on template
-        node_type = "custom"
-        template_base_lower = template_base.lower()
-        if "start" in template_base_lower:
-            node_type = "start"
-        elif "result" in template_base_lower:
-            node_type = "result"
-
-        # Build node data
-        node_data = {
-            "title": request.title,
-            "description": request.description or f"Created from {template_base} template",
-            "file": node_file_name
-        }
-
-        # Add componentType if provided
-        if request.component_type:
-            node_data["componentType"] = request.component_type
-        elif template_source == "user":
-            node_data["componentType"] = "user-template"
-
-        if user_template_id:
-            node_data["user_template_id"] = user_template_id
-            if stored_metadata:
-                node_data["user_metadata"] = stored_metadata
-
-        # Add node to structure
-        new_node = {
-            "id": request.node_id,
-            "type": node_type,
+        # Copy template to node file (off-loop so disk latency doesn't block
+        # uvicorn). copyfile takes the kernel sendfile fast path on Linux and
+        # skips copy's extra permission-copying stat/chmod. Deliberately not a
+        # hardlink: savecode truncates the node file in place, which would
+        # write through a link into the shared template.
+        await asyncio.to_thread(shutil.copyfile, template_file, node_file_path)
+
+        # Determine node type based on template
+        node_type = "custom"
+        template_base_lower = template_base.lower()
+        if "start" in template_base_lower:
+            node_type = "start"
+        elif "result" in template_base_lower:
+            node_type = "result"
+
+        # Build node data
+        node_data = {
+            "title": request.title,
+            "description": request.description or f"Created from {template_base} template",
+            "file": node_file_name
+        }
+
+        # Add componentType if provided
+        if request.component_type:
+            node_data["componentType"] = request.component_type
+        elif template_source == "user":
+            node_data["componentType"] = "user-template"
+
+        if user_template_id:
+            node_data["user_template_id"] = user_template_id
+            if stored_metadata:
+                node_data["user_metadata"] = stored_metadata
+
+        # Add node to structure
+        new_node = {
+            "id": request.node_id,
+            "type": node_type,
             "position": {"x": 250, "y": 100},  # Default position
             "data": node_data
         }
         
-        # Check if node already exists
-        node_exists = False
-        for i, node in enumerate(structure["nodes"]):
-            if node["id"] == request.node_id:
-                structure["nodes"][i] = new_node
-                node_exists = True
-                break
-        
-        if not node_exists:
-            structure["nodes"].append(new_node)
-        
-        # Save updated structure
-        with open(structure_file, 'w') as f:
-            json.dump(structure, f, indent=2)
-        
-        response_payload = {
-            "success": True,
-            "node_id": request.node_id,
-            "file_name": node_file_name,
-            "message": f"Node created from template '{request.template_name}'",
-        }
-
-        if user_template_id:
-            response_payload["user_template_id"] = user_template_id
-            if stored_metadata:
-                response_payload["metadata"] = stored_metadata
-
-        return response_payload
+        # Update structure.json under the project's lock so concurrent
+        # creates don't overwrite each other's read-modify-write
+        structure_file = project_dir / "structure.json"
+        async with _project_locks[request.project_id]:
+            structure = await asyncio.to_thread(_load_structure, structure_file)
+
+            # Replace in place if the node already exists (O(1) via an id index)
+            node_index = {node["id"]: i for i, node in enumerate(structure["nodes"])}
+            existing = node_index.get(request.node_id)
+            if existing is not None:
+                structure["nodes"][existing] = new_node
+            else:
+                structure["nodes"].append(new_node)
+
+            await asyncio.to_thread(_save_structure, structure_file, structure)
+
+        response_payload = {
+            "success": True,
+            "node_id": request.node_id,
+            "file_name": node_file_name,
+            "message": f"Node created from template '{request.template_name}'",
+        }
+
+        if user_template_id:
+            response_payload["user_template_id"] = user_template_id
+            if stored_metadata:
+                response_payload["metadata"] = stored_metadata
+
+        return response_payload
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _read_template_description(template_file: Path) -> str:
+    """Pull a one-line description from the top of a template file.
+
+    Only the first few lines matter, so read a bounded prefix instead of the
+    whole file.
+    """
+    async with aiofiles.open(template_file, 'r') as f:
+        header = await f.read(2048)
+
+    for line in header.splitlines()[:10]:
+        if line.strip().startswith('"""'):
+            continue
+        if '"""' in line:
+            break
+        if line.strip():
+            return line.strip()
+    return ""
+
+
+async def _resolve_template_file(template_name: str) -> Path:
+    """Resolve a template name (builtin or user) to its file, or 404."""
+    if template_name.startswith(USER_TEMPLATE_PREFIX):
+        candidate_id = template_name[len(USER_TEMPLATE_PREFIX):].strip()
+        if not candidate_id:
+            raise HTTPException(status_code=400, detail="Invalid user template identifier")
+
+        try:
+            user_component = user_component_service.get_user_component(candidate_id)
+        except FileNotFoundError as exc:
+            raise HTTPException(status_code=404, detail=str(exc)) from exc
+
+        template_file = user_component.path / "node.py"
+    else:
+        index = await asyncio.to_thread(_get_template_index)
+        template_file = index.get(template_name)
+
+    if not template_file or not template_file.exists():
+        raise HTTPException(status_code=404, detail=f"Template '{template_name}' not found")
+    return template_file
+
+
+@router.get("/template-raw/{template_name:path}")
+async def get_template_file(template_name: str, request: Request):
+    """Serve template code as a raw file (sendfile path, HTTP-cacheable)"""
+    template_file = await _resolve_template_file(template_name)
+
+    etag = f'"{template_file.stat().st_mtime_ns}"'
+    headers = {"ETag": etag, "Cache-Control": "max-age=60"}
+
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(template_file, media_type="text/x-python", headers=headers)
+
+
 @router.get("/template/{template_name:path}")
 async def get_template_code(template_name: str):
     """Get the code content of a specific template"""
     try:
-        # Handle both category/template and direct template names
-        template_file: Optional[Path] = None
-
-        if template_name.startswith(USER_TEMPLATE_PREFIX):
-            candidate_id = template_name[len(USER_TEMPLATE_PREFIX):].strip()
-            if not candidate_id:
-                raise HTTPException(status_code=400, detail="Invalid user template identifier")
-
-            try:
-                user_component = user_component_service.get_user_component(candidate_id)
-            except FileNotFoundError as exc:
-                raise HTTPException(status_code=404, detail=str(exc)) from exc
-
-            template_file = user_component.path / "node.py"
-        elif "/" in template_name:
-            template_file = TEMPLATES_DIR / f"{template_name}.py"
-        else:
-            for category in CATEGORY_FOLDERS:
-                potential_file = TEMPLATES_DIR / category / f"{template_name}.py"
-                if potential_file.exists():
-                    template_file = potential_file
-                    break
-
-            if not template_file:
-                potential_file = TEMPLATES_DIR / f"{template_name}.py"
-                if potential_file.exists():
-                    template_file = potential_file
-
-        if not template_file or not template_file.exists():
-            raise HTTPException(status_code=404, detail=f"Template '{template_name}' not found")
-        
-        with open(template_file, 'r') as f:
-            code = f.read()
-        
+        # Handle both category/template and direct template names
+        template_file = await _resolve_template_file(template_name)
+
+        async with aiofiles.open(template_file, 'r') as f:
+            code = await f.read()
+
         return {
             "success": True,
             "template_name": template_name,
@@ -300,4 +403,4 @@ async def get_template_code(template_name: str):
         }
         
     except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        raise HTTPException(status_code=500, detail=str(e))
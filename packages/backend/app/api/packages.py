@@ -1,11 +1,47 @@
 from datetime import datetime, timezone
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 from typing import List, Union
 
 from ..core import project_operations, venv_manager
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
+
+# Fingerprint of the last package list written per project, so polling /list
+# doesn't rewrite env_meta.json when nothing changed
+_last_list_fingerprint: dict = {}
+
+
+def _package_fingerprint(package_list: List[dict]) -> int:
+    return hash(tuple(sorted(
+        f"{pkg.get('name', '')}=={pkg.get('version', '')}" for pkg in package_list
+    )))
+
+
+# Cached pip-list output per project, keyed by site-packages mtime; the pip
+# subprocess is the slow part of these endpoints and only needs to rerun
+# after something actually (un)installed
+_package_list_cache: dict = {}
+
+
+def _site_packages_mtime(project_path) -> int:
+    try:
+        paths = venv_manager.site_packages_paths(project_path)
+    except venv_manager.VenvError:
+        return -1
+    return max((path.stat().st_mtime_ns for path in paths), default=-1)
+
+
+def _installed_packages(project_id: str, project_path) -> List[dict]:
+    mtime = _site_packages_mtime(project_path)
+    cached = _package_list_cache.get(project_id)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    package_list = venv_manager.list_installed(project_path)
+    _package_list_cache[project_id] = (_site_packages_mtime(project_path), package_list)
+    return package_list
 
 
 class PackageRequest(BaseModel):
@@ -35,6 +71,7 @@ async def install_packages(project_id: str, request: PackageRequest):
     try:
         result = venv_manager.install(project_path, packages)
         package_list = venv_manager.list_installed(project_path)
+        _package_list_cache[project_id] = (_site_packages_mtime(project_path), package_list)
         log_path = venv_manager.write_pip_log(
             project_path,
             action="install",
@@ -54,6 +91,7 @@ async def install_packages(project_id: str, request: PackageRequest):
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             },
         )
+        _last_list_fingerprint[project_id] = _package_fingerprint(package_list)
         metadata = venv_manager.read_env_metadata(project_path)
         return {
             "success": True,
@@ -89,6 +127,7 @@ async def uninstall_packages(project_id: str, request: PackageRequest):
     try:
         result = venv_manager.uninstall(project_path, packages)
         package_list = venv_manager.list_installed(project_path)
+        _package_list_cache[project_id] = (_site_packages_mtime(project_path), package_list)
         log_path = venv_manager.write_pip_log(
             project_path,
             action="uninstall",
@@ -108,6 +147,7 @@ async def uninstall_packages(project_id: str, request: PackageRequest):
                 "timestamp": datetime.now(timezone.utc).isoformat(),
             },
         )
+        _last_list_fingerprint[project_id] = _package_fingerprint(package_list)
         metadata = venv_manager.read_env_metadata(project_path)
         return {
             "success": True,
@@ -140,19 +180,23 @@ async def list_packages(project_id: str):
         raise HTTPException(status_code=404, detail=str(exc))
 
     try:
-        package_list = venv_manager.list_installed(project_path)
-        # Keep metadata current even when just listing
-        venv_manager.update_env_metadata(
-            project_path,
-            package_list,
-            {
-                "action": "list",
-                "packages": [],
-                "success": True,
-                "log_path": None,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
-            },
-        )
+        package_list = _installed_packages(project_id, project_path)
+        # Keep metadata current even when just listing, but skip the disk
+        # write when the installed set hasn't changed since the last one
+        fingerprint = _package_fingerprint(package_list)
+        if _last_list_fingerprint.get(project_id) != fingerprint:
+            venv_manager.update_env_metadata(
+                project_path,
+                package_list,
+                {
+                    "action": "list",
+                    "packages": [],
+                    "success": True,
+                    "log_path": None,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+            _last_list_fingerprint[project_id] = fingerprint
         metadata = venv_manager.read_env_metadata(project_path)
         return {
             "success": True,
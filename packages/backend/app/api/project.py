@@ -460,16 +460,15 @@ async def get_full_node_result(project_id: str, node_id: str):
     try:
         executor = get_executor()
         
-        # Check if there's a reference in the object store
-        if project_id in executor.object_stores:
-            # Look for the node's result in object store
-            for ref_id, data in executor.object_stores[project_id].items():
-                if ref_id.startswith(f"{node_id}_"):
-                    return {
-                        "success": True,
-                        "data": data,
-                        "node_id": node_id
-                    }
+        # Look for the node's result in the object store
+        ref_prefix = f"{node_id}_"
+        for (ref_project_id, ref_id), data in executor.object_store.items():
+            if ref_project_id == project_id and ref_id.startswith(ref_prefix):
+                return {
+                    "success": True,
+                    "data": data,
+                    "node_id": node_id
+                }
         
         # If no reference found, return error
         return {
@@ -3,13 +3,14 @@
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field, ValidationError
 
 from app.core import user_components as user_component_service
 from app.core.user_components import UserComponent
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
 
 class PortMetadata(BaseModel):
@@ -50,9 +51,18 @@ class CreateUserComponentRequest(BaseModel):
 
 
 @router.post("/", response_model=UserComponentMetadata)
-async def create_user_component(payload: CreateUserComponentRequest) -> UserComponentMetadata:
+async def create_user_component(request: Request) -> UserComponentMetadata:
     """Persist a new user component template to disk."""
 
+    # Parse and validate the body in one pass; component code payloads can be
+    # sizable and this skips the intermediate json.loads dict.
+    try:
+        payload = CreateUserComponentRequest.model_validate_json(await request.body())
+    except ValidationError as exc:
+        raise HTTPException(
+            status_code=422, detail=exc.errors(include_url=False)
+        ) from exc
+
     try:
         component = user_component_service.save_user_component(
             name=payload.name,
@@ -121,6 +131,14 @@ def _normalise_metadata(metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
 
     # Ensure items are dict-like for Pydantic
     def _coerce_ports(candidates):
+        # Stored metadata is usually already well-formed; skip the per-port
+        # dict rebuild and let Pydantic consume it directly
+        if all(
+            isinstance(item, dict) and item.keys() >= {"name", "type"}
+            for item in candidates
+        ):
+            return list(candidates)
+
         coerced = []
         for item in candidates:
             if isinstance(item, dict):
@@ -1,5 +1,12 @@
 from typing import Dict, Any, Optional
 
+# Edge fields handled explicitly by create_edge; extra kwargs matching these
+# must not overwrite them
+_RESERVED_EDGE_KEYS = frozenset({
+    "id", "type", "source", "target", "sourceHandle", "targetHandle",
+    "markerEnd", "source_handle", "target_handle",
+})
+
 def create_edge(project_id: str, edge_id: str, edge_type: str, source: str, target: str, 
                 marker_end: Optional[Dict] = None, source_handle: Optional[str] = None,
                 target_handle: Optional[str] = None, **kwargs) -> Dict[str, Any]:
@@ -38,7 +45,7 @@ def create_edge(project_id: str, edge_id: str, edge_type: str, source: str, targ
     
     # Add any additional properties
     for key, value in kwargs.items():
-        if key not in ["id", "type", "source", "target", "sourceHandle", "targetHandle", "markerEnd", "source_handle", "target_handle"] and value is not None:
+        if key not in _RESERVED_EDGE_KEYS and value is not None:
             new_edge[key] = value
     
     structure['edges'].append(new_edge)
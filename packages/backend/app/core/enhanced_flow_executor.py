@@ -1,1627 +1,2143 @@
-"""
-Enhanced Flow Executor with Object Store Support
-Enables passing Python objects between nodes without JSON serialization
-"""
-
-import json
-import sys
-import time
-import inspect
-import traceback
-import asyncio
-from typing import (
-    Any,
-    Dict,
-    Optional,
-    List,
-    Set,
-    Tuple,
-    get_type_hints,
-    get_origin,
-    get_args,
-)
-from pathlib import Path
-from collections import defaultdict, deque
-import ast
-
-from .flow_executor import FlowExecutor
-from .execute_code import execute_python_code
-from . import venv_manager
-
-
-class EnhancedFlowExecutor(FlowExecutor):
-    """Enhanced Flow Executor that supports Python object passing between nodes"""
-
-    # Display configuration
-    MAX_DISPLAY_LENGTH = 30000  # Maximum characters to display in Result Node
-
-    def __init__(self, projects_root: str):
-        super().__init__(projects_root)
-        # Object store for each project - stores Python objects that can't be JSON serialized
-        self.object_stores = {}  # {project_id: {ref_id: object}}
-
-    def _execute_node_isolated(
-        self,
-        project_id: str,
-        node_id: str,
-        node_data: Dict,
-        input_data: Any,
-        timeout: int = 30,
-        target_handles: Optional[
-            Dict[str, str]
-        ] = None,  # Map of source_id -> target_handle
-        result_node_values: Optional[Dict[str, Any]] = None,
-    ) -> Dict[str, Any]:
-        """Execute node in the same process to enable object passing"""
-
-        node_type = node_data.get("type", "custom")
-
-        # Handle start nodes
-        if node_type == "start":
-            return {
-                "status": "success",
-                "output": None,
-                "execution_time_ms": 0,
-                "logs": "Start node - flow initiated",
-            }
-
-        # Handle textInput nodes - check componentType first, then legacy title check
-        component_type = node_data.get("data", {}).get("componentType", "")
-        is_text_input = (
-            node_type == "textInput"
-            or component_type == "TextInput"
-            or (
-                node_type == "custom"
-                and node_data.get("data", {}).get("title", "").startswith("Text Input")
-            )
-        )
-
-        if is_text_input:
-            # TextInput nodes always use their stored value from localStorage (passed via result_node_values)
-            stored_value = (
-                result_node_values.get(node_id) if result_node_values else None
-            )
-
-            # Frontend sends the value directly as a string (not wrapped)
-            # But if it comes as dict for some reason, unwrap it
-            if isinstance(stored_value, dict):
-                # Could be {'value': actual_value} or {'display': ..., 'raw_value': ...}
-                if "value" in stored_value:
-                    stored_value = stored_value["value"]
-                elif "raw_value" in stored_value:
-                    stored_value = stored_value["raw_value"]
-                elif "display" in stored_value:
-                    stored_value = stored_value["display"]
-
-            pass  # TextInput node value stored
-
-            if stored_value is not None and stored_value != "":
-                # Return the stored value directly as a string (not wrapped in dict)
-                # This allows it to be used directly as parameter values
-                return {
-                    "status": "success",
-                    "output": stored_value,  # Direct string value, not wrapped
-                    "execution_time_ms": 0,
-                    "logs": "Text Input node - using stored value",
-                }
-            else:
-                # No stored value, return empty string
-                return {
-                    "status": "success",
-                    "output": "",  # Empty string, not wrapped
-                    "execution_time_ms": 0,
-                    "logs": "Text Input node - no stored value",
-                }
-
-        # Handle result nodes
-        if node_type == "result":
-            # Check if there's a stored value for this result node
-            stored_value = (
-                result_node_values.get(node_id) if result_node_values else None
-            )
-
-            # Determine if we should use stored value or new input
-            # If we have new input (this Result node receives data from upstream nodes), use it
-            # If no new input but we have stored value (this Result node is being used as input), use stored value
-            if input_data is not None:
-                # We have new input from upstream nodes, this will update the stored value
-                # If input is a dict with single key like {"input_18": value}, unwrap it
-                if isinstance(input_data, dict) and len(input_data) == 1:
-                    key = list(input_data.keys())[0]
-                    if key.startswith("input_"):
-                        input_data = input_data[key]
-
-                # Check if the input is an error from upstream node
-                if isinstance(input_data, dict) and input_data.get("_error") == True:
-                    # This is an error from upstream, return it as error status
-                    return {
-                        "status": "error",
-                        "error": input_data.get(
-                            "error", "Unknown error from upstream node"
-                        ),
-                        "logs": input_data.get("logs", ""),
-                        "execution_time_ms": 0,
-                        "output": None,
-                    }
-            elif stored_value is not None:
-                # No new input, but we have a stored value from previous execution
-                # This Result node is being used as an input source
-                input_data = stored_value
-            else:
-                # No input and no stored value
-                input_data = ""
-
-            # Wrap non-JSON serializable objects as references
-            input_data = self._wrap_output(project_id, node_id, input_data)
-
-            # Prepare both display and full data
-            display_output = input_data
-            full_data_ref = None
-
-            # Handle reference objects specially for Result nodes
-            if isinstance(input_data, dict) and input_data.get("type") == "reference":
-                # Store the reference for full data access
-                full_data_ref = input_data.get("ref")
-
-                # Unwrap the reference to get actual value
-                unwrapped = self._unwrap_input(project_id, input_data)
-
-                # Apply size limit to prevent huge outputs
-                if isinstance(unwrapped, str):
-                    display_output = unwrapped[: self.MAX_DISPLAY_LENGTH] + (
-                        "..." if len(unwrapped) > self.MAX_DISPLAY_LENGTH else ""
-                    )
-                elif isinstance(unwrapped, (dict, list)):
-                    # Convert to JSON for readable display
-                    import json
-
-                    try:
-                        json_str = json.dumps(unwrapped, indent=2, ensure_ascii=False)
-                        display_output = json_str[: self.MAX_DISPLAY_LENGTH] + (
-                            "..." if len(json_str) > self.MAX_DISPLAY_LENGTH else ""
-                        )
-                    except:
-                        # Fallback to string representation
-                        display_output = str(unwrapped)[: self.MAX_DISPLAY_LENGTH]
-                else:
-                    display_output = str(unwrapped)[: self.MAX_DISPLAY_LENGTH]
-            else:
-                # Not a reference, check if it needs truncation
-                if (
-                    isinstance(input_data, str)
-                    and len(input_data) > self.MAX_DISPLAY_LENGTH
-                ):
-                    display_output = input_data[: self.MAX_DISPLAY_LENGTH] + "..."
-                elif isinstance(input_data, (dict, list)):
-                    import json
-
-                    try:
-                        json_str = json.dumps(input_data, indent=2, ensure_ascii=False)
-                        if len(json_str) > self.MAX_DISPLAY_LENGTH:
-                            display_output = json_str[: self.MAX_DISPLAY_LENGTH] + "..."
-                        else:
-                            display_output = json_str
-                    except:
-                        display_output = str(input_data)[: self.MAX_DISPLAY_LENGTH]
-
-            # For ResultNode, we need to pass through the actual value
-            # while also providing display information
-            # The output should be the actual value (for pass-through)
-            # with display metadata attached
-
-            # Pass through the actual input data as output
-            # so it can be used by downstream nodes
-            # Keep it as reference if it was wrapped
-            actual_output = input_data
-
-            # Create display metadata for frontend
-            display_metadata = {
-                "display": display_output,
-                "full_ref": full_data_ref,
-                "is_truncated": isinstance(display_output, str)
-                and display_output.endswith("..."),
-            }
-
-            # Store display metadata in a special key that frontend can recognize
-            # but pass the actual value as the main output
-            return {
-                "status": "success",
-                "output": actual_output,  # Pass through the reference (not unwrapped)
-                "display_metadata": display_metadata,  # Metadata for UI display
-                "execution_time_ms": 0,
-                "logs": "Result node - passing through data",
-            }
-
-        # Handle custom nodes with in-process execution
-        try:
-            start_time = time.time()
-
-            # 1. Unwrap input data (convert references to actual objects)
-            actual_input = self._unwrap_input(project_id, input_data)
-
-            # 2. If we have target handle information, restructure input for RunScript
-            # Check if input_data already has handle names as keys (from multi-input scenario)
-            # In that case, it's already properly structured and we don't need to restructure
-            if target_handles and isinstance(actual_input, dict):
-                # Check if the keys are already handle names (not source IDs)
-                handle_values = set(target_handles.values())
-                input_keys = set(actual_input.keys())
-
-                if input_keys == handle_values or input_keys.issubset(handle_values):
-                    # Input is already structured with handle names, don't restructure
-                    pass
-                else:
-                    # Input has source IDs as keys, need to restructure
-                    restructured_input = {}
-                    for source_id, value in actual_input.items():
-                        if source_id in target_handles:
-                            # Use the target handle as the parameter name
-                            handle_name = target_handles[source_id]
-                            restructured_input[handle_name] = value
-                        else:
-                            # Keep original key if no handle mapping
-                            restructured_input[source_id] = value
-                    actual_input = restructured_input
-            elif target_handles and len(target_handles) == 1:
-                # Single input with target handle - wrap in dict with handle name
-                handle_name = list(target_handles.values())[0]
-                if handle_name:
-                    actual_input = {handle_name: actual_input}
-
-            # 3. Execute node code in the same process
-            result = self._execute_in_process(
-                project_id, node_id, node_data, actual_input
-            )
-
-            # 4. Wrap output (store objects and return references if needed)
-            wrapped_output = self._wrap_output(project_id, node_id, result)
-
-            execution_time_ms = round((time.time() - start_time) * 1000)
-
-            return {
-                "status": "success",
-                "output": wrapped_output,
-                "execution_time_ms": execution_time_ms,
-                "logs": "",
-            }
-
-        except Exception as e:
-            error_msg = str(e)
-            full_traceback = traceback.format_exc()
-
-            # for debugging
-            # print(f"\n{'='*60}")
-            # print(f"🔴 NODE EXECUTION ERROR - Node: {node_id}")
-            # print(f"{'='*60}")
-            # print(f"Error Type: {type(e).__name__}")
-            # print(f"Error Message: {error_msg}")
-            # print(f"\nFull Traceback:")
-            # print(full_traceback)
-            # print('='*60 + '\n')
-
-            return {
-                "status": "error",
-                "error": error_msg,
-                "execution_time_ms": 0,
-                "logs": full_traceback,
-            }
-
-    def _execute_in_process(
-        self, project_id: str, node_id: str, node_data: Dict, input_data: Any
-    ) -> Any:
-        """Execute node code in the same process with a safe namespace"""
-
-        project_path = self.projects_root / project_id
-
-        try:
-            with venv_manager.activated(project_path):
-                # Add AIM-RedLab to Python path for imports
-                import sys
-                import os
-
-                aim_redlab_path = os.environ.get(
-                    "AIM_REDLAB_PATH", "/Users/kwontaeyoun/Desktop/AIM/AIM-RedLab"
-                )
-                if os.path.exists(aim_redlab_path) and aim_redlab_path not in sys.path:
-                    sys.path.insert(0, aim_redlab_path)
-
-                # Get node file path
-                file_name = node_data.get("data", {}).get("file")
-                if not file_name:
-                    title = node_data.get("data", {}).get("title", f"Node_{node_id}")
-                    sanitized_title = "".join(
-                        c if c.isalnum() or c == "_" else "_" for c in title
-                    )
-                    file_name = f"{node_id}_{sanitized_title}.py"
-
-                file_path = project_path / file_name
-
-                if not file_path.exists():
-                    raise FileNotFoundError(f"Node file '{file_name}' not found")
-
-                # Read node code
-                with open(file_path, "r", encoding="utf-8") as f:
-                    node_code = f.read()
-
-                # Create safe execution namespace
-                namespace = self._create_safe_namespace(input_data)
-
-                # Execute the code
-                exec(node_code, namespace)
-
-                # Find and execute the main function
-                result = None
-                function_found = False
-
-                # Priority: RunScript > main > first callable
-                if "RunScript" in namespace and callable(namespace["RunScript"]):
-                    result = self._call_function_with_input(
-                        namespace["RunScript"], input_data
-                    )
-                    function_found = True
-                elif "main" in namespace and callable(namespace["main"]):
-                    result = self._call_function_with_input(
-                        namespace["main"], input_data
-                    )
-                    function_found = True
-                else:
-                    # Find first callable function
-                    for name, obj in namespace.items():
-                        if (
-                            callable(obj)
-                            and not name.startswith("_")
-                            and name
-                            not in [
-                                "json",
-                                "sys",
-                                "traceback",
-                                "inspect",
-                                "math",
-                                "datetime",
-                                "pandas",
-                                "pd",
-                                "numpy",
-                                "np",
-                            ]
-                        ):
-                            result = self._call_function_with_input(obj, input_data)
-                            function_found = True
-                            break
-
-                if not function_found:
-                    raise RuntimeError("No callable function found in node")
-
-                return result
-        except venv_manager.VenvError as exc:
-            raise RuntimeError(
-                f"Virtual environment not ready for project '{project_id}': {exc}"
-            ) from exc
-
-    def _create_safe_namespace(self, input_data: Any) -> Dict:
-        """Create a safe execution namespace with limited builtins"""
-
-        # Safe builtins - remove dangerous functions
-        safe_builtins = {
-            "abs",
-            "all",
-            "any",
-            "bool",
-            "dict",
-            "enumerate",
-            "filter",
-            "float",
-            "int",
-            "len",
-            "list",
-            "map",
-            "max",
-            "min",
-            "print",
-            "range",
-            "round",
-            "set",
-            "sorted",
-            "str",
-            "sum",
-            "tuple",
-            "type",
-            "zip",
-            "isinstance",
-            "hasattr",
-            "getattr",
-            "setattr",
-            "repr",
-            "hash",
-            "id",
-            "iter",
-            "next",
-            "reversed",
-            "__build_class__",
-            "property",
-            "classmethod",
-            "staticmethod",
-            "super",
-            "object",
-            "Exception",
-            "ValueError",
-            "TypeError",
-            "AttributeError",
-            "KeyError",
-            "IndexError",
-            "RuntimeError",
-            "__import__",  # Allow importing modules within node code
-        }
-
-        # Get the actual builtins based on how they're available
-        import builtins
-
-        namespace = {
-            "__builtins__": {
-                k: getattr(builtins, k) for k in safe_builtins if hasattr(builtins, k)
-            },
-            "__name__": "__main__",  # Required for class definitions
-            "input_data": input_data,
-            # Standard libraries
-            "json": __import__("json"),
-            "math": __import__("math"),
-            "datetime": __import__("datetime"),
-            "time": __import__("time"),
-            "random": __import__("random"),
-            "re": __import__("re"),
-            "collections": __import__("collections"),
-            "itertools": __import__("itertools"),
-            "Path": __import__("pathlib").Path,  # Add Path for file operations
-            "pathlib": __import__("pathlib"),
-            "os": __import__("os"),
-            "sys": __import__("sys"),
-            "asyncio": __import__("asyncio"),
-            "tempfile": __import__("tempfile"),
-            # AI model libraries
-            # "openai": __import__("openai"),
-            # "anthropic": __import__("anthropic"),
-            # "together": __import__("together"),
-        }
-
-        # Don't import pandas/numpy here - let nodes import them if needed
-        # This avoids import errors affecting all nodes
-
-        return namespace
-
-    def _call_function_with_input(self, func: callable, input_data: Any) -> Any:
-        """Call a function with appropriate input handling for RunScript pattern"""
-
-        try:
-            sig = inspect.signature(func)
-            params = list(sig.parameters.keys())
-
-            # No parameters - call without arguments
-            if len(params) == 0:
-                return func()
-
-            # Special handling for RunScript pattern
-            if func.__name__ == "RunScript":
-                # RunScript always uses keyword arguments from input_data dict
-                if isinstance(input_data, dict):
-                    # Build kwargs mapping input_data keys to function parameters
-                    kwargs = {}
-                    for param_name, param in sig.parameters.items():
-                        if param_name in input_data:
-                            # Use value from input_data
-                            kwargs[param_name] = input_data[param_name]
-                        elif param.default is not inspect.Parameter.empty:
-                            # Parameter has default, will use it
-                            pass
-                        else:
-                            # Required parameter missing - skip it to use Python's default behavior
-                            pass
-
-                    return func(**kwargs)
-                else:
-                    # If input is not a dict, try to pass as first parameter only
-                    first_param = params[0] if params else None
-                    if first_param:
-                        return func(**{first_param: input_data})
-                    else:
-                        return func()
-
-            # For non-RunScript functions, use original logic
-            # If input is a dict and function expects multiple parameters
-            if isinstance(input_data, dict) and len(params) > 1:
-                # Try to map dict keys to function parameters
-                kwargs = {}
-                for param_name in params:
-                    if param_name in input_data:
-                        kwargs[param_name] = input_data[param_name]
-                    elif (
-                        sig.parameters[param_name].default
-                        is not inspect.Parameter.empty
-                    ):
-                        # Use default value if available
-                        pass
-                    else:
-                        # Required parameter missing, fall back to single argument
-                        return func(input_data)
-                return func(**kwargs)
-
-            # Single parameter or non-dict input
-            if input_data is not None:
-                return func(input_data)
-            else:
-                return func()
-
-        except TypeError as e:
-            # Handle parameter mismatch errors only
-            # Don't retry for RunScript functions - they should always use kwargs
-            if func.__name__ == "RunScript":
-                raise
-
-            if "missing" in str(e) and "required positional argument" in str(e):
-                # Try calling with no arguments if it's expecting nothing
-                try:
-                    return func()
-                except:
-                    pass
-
-            # Fallback: try calling with input_data or without
-            if input_data is not None:
-                return func(input_data)
-            else:
-                return func()
-        except Exception:
-            # For any other exception (ZeroDivisionError, ValueError, etc.)
-            # Don't retry - just raise the original exception
-            raise
-
-    def _unwrap_input(self, project_id: str, data: Any) -> Any:
-        """Convert references to actual objects from the object store"""
-
-        if data is None:
-            return None
-
-        # Handle reference objects
-        if isinstance(data, dict):
-            # Check if this is a reference object
-            if data.get("type") == "reference" and "ref" in data:
-                ref = data["ref"]
-                if project_id in self.object_stores:
-                    if ref in self.object_stores[project_id]:
-                        return self.object_stores[project_id][ref]
-                    else:
-                        # Reference not found - return preview if available
-                        return data.get("preview", None)
-                return None
-
-            # Recursively unwrap dict values
-            unwrapped = {}
-            for key, value in data.items():
-                unwrapped[key] = self._unwrap_input(project_id, value)
-            return unwrapped
-
-        # Handle lists
-        if isinstance(data, list):
-            return [self._unwrap_input(project_id, item) for item in data]
-
-        # Return as-is for primitive types
-        return data
-
-    def _wrap_output(self, project_id: str, node_id: str, data: Any) -> Any:
-        """Wrap output data - use JSON for small data, references for large/complex objects"""
-
-        # Primitive types pass through directly
-        if data is None or isinstance(data, (bool, int, float, str)):
-            return data
-
-        # Try JSON serialization for small data
-        try:
-            json_str = json.dumps(data)
-            # If serializable and under 10KB, return directly
-            if len(json_str) < 10000:
-                return data
-        except (TypeError, ValueError):
-            # Not JSON serializable, need to use reference
-            pass
-
-        # Store as reference for large or complex objects
-        return self._store_as_reference(project_id, node_id, data)
-
-    def _store_as_reference(self, project_id: str, node_id: str, data: Any) -> Dict:
-        """Store an object and return a reference"""
-
-        # Initialize project store if needed
-        if project_id not in self.object_stores:
-            self.object_stores[project_id] = {}
-
-        # Generate unique reference ID
-        ref_id = f"{node_id}_{int(time.time() * 1000)}"
-
-        # Store the object
-        self.object_stores[project_id][ref_id] = data
-
-        # Return reference with metadata
-        return {
-            "type": "reference",
-            "ref": ref_id,
-            "preview": self._generate_preview(data),
-            "data_type": type(data).__name__,
-            "size": sys.getsizeof(data) if hasattr(data, "__sizeof__") else None,
-        }
-
-    def _generate_preview(self, data: Any) -> str:
-        """Generate a human-readable preview of the data"""
-
-        try:
-            # pandas DataFrame
-            if hasattr(data, "shape") and hasattr(data, "columns"):
-                return f"DataFrame: {data.shape[0]} rows × {data.shape[1]} cols"
-
-            # numpy array
-            elif hasattr(data, "shape") and hasattr(data, "ndim"):
-                return f"Array: shape={data.shape}, dtype={data.dtype}"
-
-            # List or tuple
-            elif isinstance(data, (list, tuple)):
-                preview = f"{type(data).__name__} with {len(data)} items"
-                if len(data) > 0:
-                    preview += f" (first: {str(data[0])[:50]})"
-                return preview
-
-            # Dictionary
-            elif isinstance(data, dict):
-                keys = list(data.keys())[:3]
-                preview = f"Dict with {len(data)} keys"
-                if keys:
-                    preview += f" ({', '.join(str(k) for k in keys)}{'...' if len(data) > 3 else ''})"
-                return preview
-
-            # Set
-            elif isinstance(data, set):
-                return f"Set with {len(data)} items"
-
-            # Custom objects
-            elif hasattr(data, "__class__"):
-                class_name = data.__class__.__name__
-                # Try to get a meaningful representation
-                if hasattr(data, "__len__"):
-                    return f"{class_name} ({len(data)} items)"
-                elif hasattr(data, "__str__"):
-                    str_repr = str(data)[:100]
-                    return f"{class_name}: {str_repr}{'...' if len(str(data)) > 100 else ''}"
-                else:
-                    return f"{class_name} object"
-
-            # Default: string representation
-            else:
-                preview = str(data)[:100]
-                if len(str(data)) > 100:
-                    preview += "..."
-                return preview
-
-        except Exception as e:
-            return f"{type(data).__name__} object (preview error: {str(e)[:50]})"
-
-    def cleanup_project_store(self, project_id: str):
-        """Clean up object store for a project"""
-
-        if project_id in self.object_stores:
-            # Clear all references for this project
-            self.object_stores[project_id].clear()
-            del self.object_stores[project_id]
-
-    def _extract_reachable_subgraph(
-        self, start_id: str, nodes: Dict[str, Dict], edges: List[Dict]
-    ) -> Tuple[Set[str], Dict[str, List[Tuple[str, Optional[str]]]]]:
-        """Extract nodes reachable from start node, including nodes that provide inputs"""
-        # Build adjacency list
-        adjacency = defaultdict(list)
-        reverse_adjacency = defaultdict(set)  # Track who provides input to whom
-
-        for edge in edges:
-            source = edge.get("source")
-            target = edge.get("target")
-            param = edge.get("data", {}).get("param") if edge.get("data") else None
-
-            if source in nodes and target in nodes:
-                adjacency[source].append((target, param))
-                reverse_adjacency[target].add(source)
-
-        # BFS to find reachable nodes from start
-        reachable = set()
-        queue = deque([start_id])
-
-        while queue:
-            current = queue.popleft()
-            if current in reachable:
-                continue
-            reachable.add(current)
-
-            # Add all nodes that current node connects to
-            for target, _ in adjacency[current]:
-                if target not in reachable:
-                    queue.append(target)
-
-            # IMPORTANT: Also add nodes that provide input to the current node
-            # This ensures nodes like 7 and 8 that feed into node 6 are included
-            for source in reverse_adjacency[current]:
-                if source not in reachable:
-                    queue.append(source)
-
-        return reachable, adjacency
-
-    async def execute_flow(
-        self,
-        project_id: str,
-        start_node_id: Optional[str] = None,
-        params: Optional[Dict[str, Any]] = None,
-        result_node_values: Optional[Dict[str, Any]] = None,
-        max_workers: int = 4,
-        timeout_sec: int = 30,
-        halt_on_error: bool = True,
-    ) -> Dict[str, Any]:
-        """Execute the complete flow with targetHandle support"""
-
-        # Load project structure
-        nodes, edges = self._load_structure(project_id)
-
-        # Find start node
-        if not start_node_id:
-            start_node_id = self._find_start_node(nodes)
-            if not start_node_id:
-                raise ValueError("No start node found in project")
-
-        if start_node_id not in nodes:
-            raise ValueError(f"Start node {start_node_id} not found")
-
-        # Extract reachable subgraph
-        reachable_nodes, adjacency = self._extract_reachable_subgraph(
-            start_node_id, nodes, edges
-        )
-
-        # Perform topological sort
-        execution_order = self._topological_sort(reachable_nodes, adjacency)
-
-        # Initialize execution state
-        execution_results = {}
-        node_outputs = {}
-        node_inputs = defaultdict(dict)
-
-        # Calculate dependencies
-        dependencies = defaultdict(set)
-        for edge in edges:
-            if edge["source"] in reachable_nodes and edge["target"] in reachable_nodes:
-                dependencies[edge["target"]].add(edge["source"])
-
-        # Set initial params for start node
-        if params:
-            node_inputs[start_node_id] = params
-
-        # Execution semaphore for parallel control
-        semaphore = asyncio.Semaphore(max_workers)
-
-        async def execute_node_async(node_id: str):
-            """Execute a single node asynchronously"""
-            async with semaphore:
-                # Check if all dependencies are satisfied
-                for dep in dependencies[node_id]:
-                    if dep not in execution_results:
-                        return  # Dependencies not ready
-                    if halt_on_error and execution_results[dep]["status"] == "error":
-                        execution_results[node_id] = {
-                            "status": "skipped",
-                            "error": f"Skipped due to error in dependency {dep}",
-                            "execution_time_ms": 0,
-                            "logs": "",
-                        }
-                        return
-
-                # Prepare input data with targetHandle mapping
-                input_data = None
-                target_handles = {}
-
-                # Collect inputs from edges with handle information
-                incoming_edges = [
-                    {
-                        "source": edge["source"],
-                        "targetHandle": edge.get("targetHandle"),
-                        "sourceHandle": edge.get("sourceHandle"),
-                    }
-                    for edge in edges
-                    if edge["target"] == node_id and edge["source"] in node_outputs
-                ]
-
-                if incoming_edges:
-                    # Always use dict format for consistency between single and multiple inputs
-                    input_data = {}
-
-                    for edge_info in incoming_edges:
-                        source = edge_info["source"]
-
-                        # Skip if source hasn't been executed yet
-                        if source not in node_outputs:
-                            continue
-
-                        source_output = node_outputs[source]
-
-                        # Check if source_output is a reference and unwrap it first
-                        source_output_unwrapped = source_output
-                        if (
-                            isinstance(source_output, dict)
-                            and source_output.get("type") == "reference"
-                        ):
-                            source_output_unwrapped = self._unwrap_input(
-                                project_id, source_output
-                            )
-
-                        # Extract value based on sourceHandle
-                        value = source_output_unwrapped
-                        if (
-                            isinstance(source_output_unwrapped, dict)
-                            and edge_info["sourceHandle"]
-                        ):
-                            # Extract specific output from dict
-                            if edge_info["sourceHandle"] in source_output_unwrapped:
-                                value = source_output_unwrapped[
-                                    edge_info["sourceHandle"]
-                                ]
-
-                        # Use targetHandle as key if specified
-                        if edge_info["targetHandle"]:
-                            input_data[edge_info["targetHandle"]] = value
-                            target_handles[source] = edge_info["targetHandle"]
-                        else:
-                            # For Result nodes without targetHandle, pass value directly
-                            # For other nodes, use a generic key
-                            target_node = nodes.get(node_id, {})
-                            if target_node.get("type") == "result":
-                                # Result node gets unwrapped value
-                                if not input_data:
-                                    input_data = value
-                                else:
-                                    input_data[f"input_{source}"] = value
-                            else:
-                                input_data[f"input_{source}"] = value
-                elif node_id == start_node_id and params:
-                    # Start node with initial params
-                    input_data = params
-
-                # Execute node in thread pool (blocking operation)
-                loop = asyncio.get_event_loop()
-                result = await loop.run_in_executor(
-                    None,
-                    self._execute_node_isolated,
-                    project_id,
-                    node_id,
-                    nodes[node_id],
-                    input_data,
-                    timeout_sec,
-                    target_handles if target_handles else None,
-                    result_node_values,
-                )
-
-                execution_results[node_id] = result
-
-                # Store output for downstream nodes
-                if result["status"] == "success":
-                    node_outputs[node_id] = result.get("output")
-
-        # Execute nodes in order with parallelization
-        executed = set()
-
-        while len(executed) < len(execution_order):
-            # Find nodes ready to execute
-            ready = []
-            for node_id in execution_order:
-                if node_id not in executed:
-                    # Check if all dependencies are executed
-                    if all(dep in executed for dep in dependencies[node_id]):
-                        ready.append(node_id)
-
-            # Execute ready nodes in parallel
-            if ready:
-                tasks = [execute_node_async(node_id) for node_id in ready]
-                await asyncio.gather(*tasks)
-                executed.update(ready)
-            else:
-                # No progress possible - might have cycle or error
-                break
-
-        # Collect results from result nodes
-        result_nodes = {}
-        for node_id in execution_results:
-            if nodes[node_id].get("type") == "result":
-                if execution_results[node_id]["status"] == "success":
-                    result_nodes[node_id] = execution_results[node_id]["output"]
-
-        return {
-            "success": True,
-            "run_id": f"{time.strftime('%Y-%m-%dT%H:%M:%SZ')}-{project_id}",
-            "execution_results": execution_results,
-            "result_nodes": result_nodes,
-            "execution_order": execution_order,
-            "total_execution_time_ms": sum(
-                r.get("execution_time_ms", 0)
-                for r in execution_results.values()
-                if r.get("status") == "success"
-            ),
-        }
-
-    async def execute_flow_streaming(
-        self,
-        project_id: str,
-        start_node_id: Optional[str] = None,
-        params: Optional[Dict[str, Any]] = None,
-        result_node_values: Optional[Dict[str, Any]] = None,
-        max_workers: int = 4,
-        timeout_sec: int = 30,
-        halt_on_error: bool = True,
-    ):
-        """Execute flow with streaming results - yields results as nodes complete"""
-
-        # Load project structure
-        nodes, edges = self._load_structure(project_id)
-
-        # Find start node
-        if not start_node_id:
-            start_node_id = self._find_start_node(nodes)
-            if not start_node_id:
-                raise ValueError("No start node found in project")
-
-        # Get reachable nodes and adjacency
-        reachable_nodes, adjacency = self._extract_reachable_subgraph(
-            start_node_id, nodes, edges
-        )
-
-        # Get topological order
-        execution_order = self._topological_sort(reachable_nodes, adjacency)
-
-        # Filter execution order to only include reachable nodes
-        execution_order = [node for node in execution_order if node in reachable_nodes]
-
-        # Initialize tracking
-        start_time = time.time()
-        execution_results = {}
-        node_outputs = {}
-        result_nodes = {}
-
-        # Execution control dictionary to share state between async tasks
-        execution_control = {
-            "stopped": False,
-            "error_node_id": None,
-            "error_node_title": None,
-        }
-
-        # Filter execution order to count only main processing components
-        # Exclude: start nodes, result nodes, and text input nodes from progress count
-        main_component_count = 0
-        main_component_indices = {}  # Map node_id to its index in main components
-        completed_main_components = 0  # Track completed main components
-
-        for node_id in execution_order:
-            node = nodes.get(node_id, {})
-            node_type = node.get("type", "custom")
-            node_title = node.get("data", {}).get("title", "")
-            component_type = node.get("data", {}).get("componentType", "")
-
-            # Check if this is a main processing component (exclude result, start, text input)
-            is_main_component = (
-                node_type not in ["start", "result", "textInput"]
-                and component_type != "TextInput"
-                and "Text Input" not in node_title
-                and "Start Node" not in node_title
-                and "Result Node" not in node_title
-            )
-
-            if is_main_component:
-                main_component_indices[node_id] = main_component_count
-                main_component_count += 1
-
-        # Classify Result nodes based on incoming edges
-        # Input Result nodes: no incoming edges from this pipeline (preserve values)
-        # Output Result nodes: have incoming edges from this pipeline (clear values)
-        input_result_nodes = []
-        output_result_nodes = []
-
-        for node_id in reachable_nodes:
-            node = nodes.get(node_id, {})
-            if node.get("type") == "result":
-                # Check if this Result node has incoming edges from nodes in this pipeline
-                has_incoming = False
-                for edge in edges:
-                    if edge["target"] == node_id and edge["source"] in reachable_nodes:
-                        has_incoming = True
-                        break
-
-                if has_incoming:
-                    output_result_nodes.append(node_id)
-                else:
-                    input_result_nodes.append(node_id)
-
-        # Send initial event with classified nodes
-        yield {
-            "type": "start",
-            "total_nodes": main_component_count,  # Use filtered count
-            "execution_order": execution_order,
-            "affected_nodes": list(reachable_nodes),  # All nodes in this pipeline
-            "input_result_nodes": input_result_nodes,  # Result nodes to preserve
-            "output_result_nodes": output_result_nodes,  # Result nodes to clear
-            "timestamp": time.time(),
-        }
-
-        # Calculate dependencies for each node
-        dependencies = defaultdict(set)
-        for edge in edges:
-            if edge["source"] in reachable_nodes and edge["target"] in reachable_nodes:
-                dependencies[edge["target"]].add(edge["source"])
-
-        # Execute nodes with dependency-aware parallelism
-
-        # Track which nodes are currently executing
-        executing_nodes = set()
-        completed_nodes = set()
-        completed_main_components = 0  # Track how many main components have completed
-
-        # Track nodes directly connected to error node to allow them to receive error
-        error_downstream_nodes = set()
-
-        # Process nodes in levels (nodes that can execute in parallel)
-        while len(completed_nodes) < len(execution_order):
-            # Check if execution was stopped due to error
-            if execution_control["stopped"]:
-                # If this is the first check after error, identify direct downstream Result nodes only
-                if not error_downstream_nodes and execution_control["error_node_id"]:
-                    # Find Result nodes directly connected to the error node
-                    for edge in edges:
-                        if edge["source"] == execution_control["error_node_id"]:
-                            target_node = nodes.get(edge["target"], {})
-                            # Only allow Result nodes to receive error information
-                            if target_node.get("type") == "result":
-                                error_downstream_nodes.add(edge["target"])
-
-                # Allow direct downstream nodes to execute to receive the error
-                # Skip all other remaining nodes
-                for node_id in execution_order:
-                    if (
-                        node_id not in completed_nodes
-                        and node_id not in error_downstream_nodes
-                    ):
-                        node_data = nodes[node_id]
-
-                        # Create skipped result
-                        skipped_result = {
-                            "status": "skipped",
-                            "error": f"Execution stopped due to error in node: {execution_control['error_node_title']}",
-                            "execution_time_ms": 0,
-                            "logs": "",
-                            "skipped_reason": "upstream_error",
-                            "error_source": execution_control["error_node_id"],
-                        }
-
-                        execution_results[node_id] = skipped_result
-
-                        # Send skip event for main components
-                        if node_id in main_component_indices:
-                            yield {
-                                "type": "node_complete",
-                                "node_id": node_id,
-                                "node_title": node_data.get("data", {}).get(
-                                    "title", "Unknown"
-                                ),
-                                "node_index": main_component_indices[node_id] + 1,
-                                "total_nodes": main_component_count,
-                                "result": skipped_result,
-                                "timestamp": time.time(),
-                            }
-
-                        completed_nodes.add(node_id)
-
-                # If no direct downstream nodes remain, break
-                if not any(
-                    node in error_downstream_nodes and node not in completed_nodes
-                    for node in execution_order
-                ):
-                    break
-
-            # Find nodes that can execute now (dependencies satisfied)
-            ready_nodes = []
-            for node_id in execution_order:
-                if node_id not in completed_nodes and node_id not in executing_nodes:
-                    # Check if all dependencies are completed
-                    if dependencies[node_id].issubset(completed_nodes):
-                        ready_nodes.append(node_id)
-
-            if not ready_nodes:
-                # Wait a bit if no nodes are ready
-                await asyncio.sleep(0.01)
-                continue
-
-            # Execute ready nodes in parallel
-            tasks = []
-            task_to_node = {}  # Map task to node_id for tracking
-
-            for node_id in ready_nodes:
-                executing_nodes.add(node_id)
-                node_data = nodes[node_id]
-
-                # Create async task for this node
-                # Get the main component index for this node (or -1 if not a main component)
-                main_index = main_component_indices.get(node_id, -1)
-
-                task = asyncio.create_task(
-                    self._execute_node_streaming(
-                        project_id,
-                        node_id,
-                        node_data,
-                        nodes,
-                        edges,
-                        node_outputs,
-                        execution_results,
-                        result_nodes,
-                        result_node_values,
-                        main_index,
-                        main_component_count,
-                        completed_main_components,
-                        start_node_id,
-                        params,
-                        timeout_sec,
-                        halt_on_error,
-                        execution_control,
-                    )
-                )
-                tasks.append(task)
-                task_to_node[task] = node_id
-
-            # Wait for all tasks to complete and yield results as they finish
-            pending_tasks = set(tasks)
-            while pending_tasks:
-                # Wait for at least one task to complete
-                done, pending_tasks = await asyncio.wait(
-                    pending_tasks, return_when=asyncio.FIRST_COMPLETED
-                )
-
-                # Process completed tasks
-                for completed_task in done:
-                    result = await completed_task
-                    node_id = task_to_node[completed_task]
-
-                    if result:
-                        yield result
-                        # Track completed main components for accurate progress
-                        if node_id in main_component_indices:
-                            completed_main_components += 1
-
-                    executing_nodes.remove(node_id)
-                    completed_nodes.add(node_id)
-
-        # Send complete event
-        yield {
-            "type": "complete",
-            "execution_results": execution_results,
-            "result_nodes": result_nodes,
-            "execution_order": execution_order,
-            "total_execution_time_ms": round((time.time() - start_time) * 1000),
-            "timestamp": time.time(),
-        }
-
-        return
-
-    async def _execute_node_streaming(
-        self,
-        project_id: str,
-        node_id: str,
-        node_data: Dict,
-        nodes: Dict,
-        edges: List,
-        node_outputs: Dict,
-        execution_results: Dict,
-        result_nodes: Dict,
-        result_node_values: Optional[Dict],
-        main_component_index: int,  # Index in main components (-1 if not a main component)
-        total_main_components: int,  # Total count of main components
-        completed_main_components: int,  # Number of main components completed so far
-        start_node_id: str,
-        params: Optional[Dict] = None,
-        timeout_sec: int = 30,
-        halt_on_error: bool = True,
-        execution_control: Optional[Dict] = None,  # Controls execution flow
-    ):
-        """Execute a single node and return streaming result"""
-        try:
-            # Prepare input data
-            input_data = None
-            target_handles = {}
-
-            # Collect inputs from edges
-            incoming_edges = [
-                {
-                    "source": edge["source"],
-                    "targetHandle": edge.get("targetHandle"),
-                    "sourceHandle": edge.get("sourceHandle"),
-                }
-                for edge in edges
-                if edge["target"] == node_id and edge["source"] in node_outputs
-            ]
-
-            if incoming_edges:
-                # Always use dict format for consistency between single and multiple inputs
-                input_data = {}
-
-                for edge_info in incoming_edges:
-                    source = edge_info["source"]
-
-                    # Skip if source hasn't been executed yet
-                    if source not in node_outputs:
-                        continue
-
-                    source_output = node_outputs[source]
-
-                    # Check if source_output is a reference and unwrap it first
-                    source_output_unwrapped = source_output
-                    if (
-                        isinstance(source_output, dict)
-                        and source_output.get("type") == "reference"
-                    ):
-                        source_output_unwrapped = self._unwrap_input(
-                            project_id, source_output
-                        )
-
-                    # Extract value based on sourceHandle
-                    value = source_output_unwrapped
-                    if (
-                        isinstance(source_output_unwrapped, dict)
-                        and edge_info["sourceHandle"]
-                    ):
-                        # Extract specific output from dict
-                        if edge_info["sourceHandle"] in source_output_unwrapped:
-                            value = source_output_unwrapped[edge_info["sourceHandle"]]
-
-                    # Use targetHandle as key if specified
-                    if edge_info["targetHandle"]:
-                        input_data[edge_info["targetHandle"]] = value
-                        target_handles[source] = edge_info["targetHandle"]
-                    else:
-                        # For Result nodes without targetHandle, pass value directly
-                        # For other nodes, use a generic key
-                        if node_data.get("type") == "result":
-                            # Result node gets unwrapped value
-                            if not input_data:
-                                input_data = value
-                            else:
-                                input_data[f"input_{source}"] = value
-                        else:
-                            input_data[f"input_{source}"] = value
-            elif node_id == start_node_id and params:
-                input_data = params
-
-            # Execute node
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(
-                None,
-                self._execute_node_isolated,
-                project_id,
-                node_id,
-                nodes[node_id],
-                input_data,
-                timeout_sec,
-                target_handles if target_handles else None,
-                result_node_values,
-            )
-
-            execution_results[node_id] = result
-
-            # Store output for downstream nodes
-            if result["status"] == "success":
-                node_outputs[node_id] = result.get("output")
-
-                # Handle result nodes
-                if node_data.get("type") == "result":
-                    result_nodes[node_id] = result.get("output")
-            elif result["status"] == "error":
-                # Mark as primary error and stop execution
-                node_outputs[node_id] = {
-                    "_error": True,
-                    "error_type": "primary",
-                    "status": "error",
-                    "error": result.get("error"),
-                    "logs": result.get("logs"),
-                    "node_id": node_id,
-                }
-
-                # Set flag to stop execution if execution_control is provided
-                if execution_control:
-                    execution_control["stopped"] = True
-                    execution_control["error_node_id"] = node_id
-                    execution_control["error_node_title"] = node_data.get(
-                        "data", {}
-                    ).get("title", "Unknown")
-
-            # Return node completion event
-            # Send updates for all nodes including Result nodes for real-time updates
-            # Only exclude Start and TextInput nodes from progress updates
-            if node_data.get("type") == "result":
-                # For Result nodes, send event but don't increment progress counter
-                # Use the current completed count (not incremented for Result nodes)
-                return {
-                    "type": "node_complete",
-                    "node_id": node_id,
-                    "node_title": node_data.get("data", {}).get("title", "Unknown"),
-                    "node_index": completed_main_components,  # Use current progress
-                    "total_nodes": total_main_components,
-                    "result": result,
-                    "timestamp": time.time(),
-                }
-            elif main_component_index >= 0:
-                # For main components, use their actual index
-                return {
-                    "type": "node_complete",
-                    "node_id": node_id,
-                    "node_title": node_data.get("data", {}).get("title", "Unknown"),
-                    "node_index": main_component_index + 1,  # 1-based index for display
-                    "total_nodes": total_main_components,
-                    "result": result,
-                    "timestamp": time.time(),
-                }
-            else:
-                # For auxiliary nodes (start, text input), don't send progress update
-                return None
-
-        except Exception as e:
-            # Return error event
-            error_result = {
-                "status": "error",
-                "error": str(e),
-                "execution_time_ms": 0,
-                "logs": "",
-            }
-            execution_results[node_id] = error_result
-
-            # Only send error events for main components
-            if main_component_index >= 0:
-                return {
-                    "type": "node_complete",
-                    "node_id": node_id,
-                    "node_title": node_data.get("data", {}).get("title", "Unknown"),
-                    "node_index": main_component_index + 1,
-                    "total_nodes": total_main_components,
-                    "result": error_result,
-                    "timestamp": time.time(),
-                }
-            else:
-                return None
-
-    def get_store_info(self, project_id: str) -> Dict:
-        """Get information about the object store for debugging"""
-
-        if project_id not in self.object_stores:
-            return {"exists": False, "count": 0, "refs": []}
-
-        store = self.object_stores[project_id]
-        return {
-            "exists": True,
-            "count": len(store),
-            "refs": [
-                {
-                    "ref": ref,
-                    "type": type(obj).__name__,
-                    "size": sys.getsizeof(obj) if hasattr(obj, "__sizeof__") else None,
-                }
-                for ref, obj in store.items()
-            ],
-        }
-
-    def analyze_node_signature(
-        self, project_id: str, node_id: str, node_data: Dict
-    ) -> Dict:
-        """Analyze a node's RunScript function signature for metadata"""
-
-        try:
-            # Get node file path
-            file_name = node_data.get("data", {}).get("file")
-            if not file_name:
-                title = node_data.get("data", {}).get("title", f"Node_{node_id}")
-                sanitized_title = "".join(
-                    c if c.isalnum() or c == "_" else "_" for c in title
-                )
-                file_name = f"{node_id}_{sanitized_title}.py"
-
-            file_path = self.projects_root / project_id / file_name
-
-            if not file_path.exists():
-                return {
-                    "mode": "unknown",
-                    "inputs": [],
-                    "outputs": [],
-                    "error": f"Node file '{file_name}' not found",
-                }
-
-            # Read and parse the node code
-            with open(file_path, "r", encoding="utf-8") as f:
-                node_code = f.read()
-
-            # Parse the AST to find RunScript function
-            try:
-                tree = ast.parse(node_code)
-            except SyntaxError as e:
-                return {
-                    "mode": "unknown",
-                    "inputs": [],
-                    "outputs": [],
-                    "error": f"Syntax error in node code: {e}",
-                }
-
-            # Find RunScript function
-            runscript_node = None
-            for node in ast.walk(tree):
-                if isinstance(node, ast.FunctionDef) and node.name == "RunScript":
-                    runscript_node = node
-                    break
-
-            # Determine mode and extract metadata
-            if runscript_node:
-                # Python Script Mode - has RunScript function
-                inputs = self._extract_function_inputs(runscript_node, node_code)
-                outputs = self._extract_function_outputs(runscript_node, node_code)
-
-                return {
-                    "mode": "script",
-                    "inputs": inputs,
-                    "outputs": outputs,
-                    "function_name": "RunScript",
-                }
-            else:
-                # Check for main function as fallback
-                main_node = None
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.FunctionDef) and node.name == "main":
-                        main_node = node
-                        break
-
-                if main_node:
-                    inputs = self._extract_function_inputs(main_node, node_code)
-                    outputs = self._extract_function_outputs(main_node, node_code)
-
-                    return {
-                        "mode": "basic",
-                        "inputs": inputs,
-                        "outputs": outputs,
-                        "function_name": "main",
-                    }
-                else:
-                    # No RunScript or main - basic mode
-                    return {
-                        "mode": "basic",
-                        "inputs": [
-                            {"name": "input_data", "type": "Any", "default": None}
-                        ],
-                        "outputs": [{"name": "output", "type": "Any"}],
-                        "function_name": None,
-                    }
-
-        except Exception as e:
-            return {"mode": "unknown", "inputs": [], "outputs": [], "error": str(e)}
-
-    def _extract_function_inputs(
-        self, func_node: ast.FunctionDef, source_code: str
-    ) -> List[Dict]:
-        """Extract input parameters from a function AST node"""
-
-        inputs = []
-        args = func_node.args
-
-        # Get default values (they're aligned to the right)
-        defaults = args.defaults or []
-        num_args = len(args.args)
-        num_defaults = len(defaults)
-
-        for i, arg in enumerate(args.args):
-            param_info = {
-                "name": arg.arg,
-                "type": "Any",  # Default type
-                "default": None,
-                "required": True,
-            }
-
-            # Check if this parameter has a default value
-            default_index = i - (num_args - num_defaults)
-            if default_index >= 0:
-                default_node = defaults[default_index]
-                param_info["required"] = False
-                param_info["default"] = self._extract_default_value(default_node)
-
-            # Extract type annotation if available
-            if arg.annotation:
-                param_info["type"] = self._extract_type_annotation(arg.annotation)
-
-            inputs.append(param_info)
-
-        return inputs
-
-    def _extract_function_outputs(
-        self, func_node: ast.FunctionDef, source_code: str
-    ) -> List[Dict]:
-        """Extract output keys from return statements in function"""
-
-        outputs = []
-
-        # Find all return statements
-        for node in ast.walk(func_node):
-            if isinstance(node, ast.Return) and node.value:
-                # Check if return value is a dict literal
-                if isinstance(node.value, ast.Dict):
-                    for key in node.value.keys:
-                        if isinstance(key, ast.Constant):
-                            output_name = key.value
-                            if output_name not in [o["name"] for o in outputs]:
-                                outputs.append({"name": output_name, "type": "Any"})
-                # Check if return value is a dict() call
-                elif isinstance(node.value, ast.Call):
-                    if (
-                        isinstance(node.value.func, ast.Name)
-                        and node.value.func.id == "dict"
-                    ):
-                        # Extract keys from dict(key=value) syntax
-                        for keyword in node.value.keywords:
-                            if keyword.arg:
-                                if keyword.arg not in [o["name"] for o in outputs]:
-                                    outputs.append({"name": keyword.arg, "type": "Any"})
-
-        # If no outputs found, assume single output
-        if not outputs:
-            outputs = [{"name": "output", "type": "Any"}]
-
-        return outputs
-
-    def _extract_type_annotation(self, annotation_node) -> str:
-        """Extract type annotation as string"""
-
-        if isinstance(annotation_node, ast.Name):
-            return annotation_node.id
-        elif isinstance(annotation_node, ast.Constant):
-            return str(annotation_node.value)
-        elif isinstance(annotation_node, ast.Subscript):
-            # Handle Generic types like List[int], Optional[str], Literal["a","b"]
-            base = self._extract_type_annotation(annotation_node.value)
-
-            # Special handling for Literal
-            if base == "Literal":
-                if isinstance(annotation_node.slice, ast.Tuple):
-                    values = []
-                    for elt in annotation_node.slice.elts:
-                        if isinstance(elt, ast.Constant):
-                            values.append(elt.value)
-                    return f"Literal{values}"
-                elif isinstance(annotation_node.slice, ast.Constant):
-                    return f"Literal[{annotation_node.slice.value}]"
-
-            # Handle other generic types
-            if isinstance(annotation_node.slice, ast.Name):
-                return f"{base}[{annotation_node.slice.id}]"
-            elif isinstance(annotation_node.slice, ast.Constant):
-                return f"{base}[{annotation_node.slice.value}]"
-            else:
-                return base
-        else:
-            return "Any"
-
-    def _extract_default_value(self, default_node):
-        """Extract default value from AST node"""
-
-        if isinstance(default_node, ast.Constant):
-            return default_node.value
-        elif isinstance(default_node, ast.Name):
-            # Handle True, False, None
-            if default_node.id in ["True", "False", "None"]:
-                return {"True": True, "False": False, "None": None}[default_node.id]
-            return default_node.id
-        elif isinstance(default_node, ast.UnaryOp) and isinstance(
-            default_node.op, ast.USub
-        ):
-            # Handle negative numbers
-            if isinstance(default_node.operand, ast.Constant):
-                return -default_node.operand.value
-        elif isinstance(default_node, ast.List):
-            return []
-        elif isinstance(default_node, ast.Dict):
-            return {}
-        elif isinstance(default_node, ast.Tuple):
-            return ()
-
-        return None
+"""
+Enhanced Flow Executor with Object Store Support
+Enables passing Python objects between nodes without JSON serialization
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+import itertools
+import inspect
+import traceback
+import asyncio
+import graphlib
+import weakref
+from typing import (
+    Any,
+    Dict,
+    NamedTuple,
+    Optional,
+    List,
+    Set,
+    Tuple,
+    get_type_hints,
+    get_origin,
+    get_args,
+)
+from pathlib import Path
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import ast
+
+from .flow_executor import FlowExecutor
+from .execute_code import execute_python_code
+from . import venv_manager
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+class Edge(NamedTuple):
+    """Canonical edge record built once per structure load.
+
+    Attribute reads replace the repeated dict.get chains the executors paid
+    per edge per run, and a tuple is smaller than the raw edge dict.
+    """
+
+    source: str
+    target: str
+    source_handle: Optional[str] = None
+    target_handle: Optional[str] = None
+    param: Optional[str] = None
+
+
+@dataclass(slots=True)
+class FlowPlan:
+    """Precomputed execution plan for a project flow.
+
+    The graph's shape only changes when structure.json is edited, so the
+    reachability/topology analysis is cached by file mtime and reused across
+    repeated runs of the same flow.
+    """
+
+    nodes: Dict[str, Dict]
+    edges: List[Edge]
+    start_node_id: str
+    reachable_nodes: Set[str]
+    adjacency: Dict[str, List]
+    execution_order: List[str]
+    dependencies: Dict[str, Tuple[str, ...]]
+    incoming_by_target: Dict[str, List[Edge]]
+    # Streaming progress/classification, precomputed so runs skip the
+    # per-request substring checks over every node
+    main_component_indices: Dict[str, int]
+    input_result_nodes: List[str]
+    output_result_nodes: List[str]
+
+
+@dataclass(slots=True)
+class _StreamRun:
+    """Run-wide state shared by every node task of one streaming execution.
+
+    Bundling this once per run keeps _execute_node_streaming down to the
+    context plus per-node values instead of threading a dozen identical
+    arguments through every task.
+    """
+
+    project_id: str
+    nodes: Dict[str, Dict]
+    incoming_by_target: Dict[str, List[Edge]]
+    node_outputs: Dict[str, Any]
+    execution_results: Dict[str, Any]
+    result_nodes: Dict[str, Any]
+    result_node_values: Optional[Dict[str, Any]]
+    start_node_id: str
+    params: Optional[Dict[str, Any]]
+    timeout_sec: int
+    execution_control: Dict[str, Any]
+    total_main_components: int
+
+
+def _cheap_size(data: Any) -> Optional[int]:
+    """Best-effort content size in bytes for reference metadata.
+
+    sys.getsizeof only reports shallow container size (and ignores numpy /
+    pandas buffers entirely), so report accurate sizes where the type exposes
+    them cheaply and None otherwise.
+    """
+    nbytes = getattr(data, "nbytes", None)  # numpy arrays
+    if isinstance(nbytes, int):
+        return nbytes
+    memory_usage = getattr(data, "memory_usage", None)  # pandas objects
+    if callable(memory_usage):
+        try:
+            return int(memory_usage(deep=True).sum())
+        except Exception:
+            return None
+    return None
+
+
+def _display_dumps(data: Any) -> str:
+    """Pretty-print data for Result-node display (orjson when available)"""
+    if orjson is not None:
+        return orjson.dumps(
+            data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(data, indent=2, ensure_ascii=False)
+
+
+def _canonical_dumps(data: Any) -> Optional[bytes]:
+    """Stable serialized form of JSON-compatible data, or None.
+
+    Keys are sorted so logically equal inputs produce the same bytes; data
+    that doesn't serialize (custom objects, NaN via orjson) yields None.
+    """
+    try:
+        if orjson is not None:
+            return orjson.dumps(
+                data, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+            )
+        return json.dumps(data, sort_keys=True, ensure_ascii=False).encode()
+    except (TypeError, ValueError):
+        return None
+
+
+def _canonical_loads(blob: bytes) -> Any:
+    """Inverse of _canonical_dumps"""
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
+
+def _annot_name(node: ast.Name) -> str:
+    return node.id
+
+
+def _annot_constant(node: ast.Constant) -> str:
+    return str(node.value)
+
+
+def _annot_subscript(node: ast.Subscript) -> str:
+    # Generic types like List[int], Optional[str], Literal["a","b"]
+    base = _annotation_to_str(node.value)
+    slice_node = node.slice
+
+    if base == "Literal":
+        if type(slice_node) is ast.Tuple:
+            values = [
+                elt.value for elt in slice_node.elts if type(elt) is ast.Constant
+            ]
+            return f"Literal{values}"
+        if type(slice_node) is ast.Constant:
+            return f"Literal[{slice_node.value}]"
+
+    if type(slice_node) is ast.Name:
+        return f"{base}[{slice_node.id}]"
+    if type(slice_node) is ast.Constant:
+        return f"{base}[{slice_node.value}]"
+    return base
+
+
+# Exact-type dispatch table: annotation nodes come straight out of ast.parse,
+# so type(node) lookups replace the isinstance chain on this hot path
+_ANNOT_HANDLERS: Dict[type, Any] = {
+    ast.Name: _annot_name,
+    ast.Constant: _annot_constant,
+    ast.Subscript: _annot_subscript,
+}
+
+
+def _annotation_to_str(annotation_node: Any) -> str:
+    """Render a parameter's type annotation node as a display string"""
+    handler = _ANNOT_HANDLERS.get(type(annotation_node))
+    return handler(annotation_node) if handler is not None else "Any"
+
+
+def _default_negative(node: ast.UnaryOp) -> Any:
+    if type(node.op) is ast.USub and type(node.operand) is ast.Constant:
+        return -node.operand.value
+    return None
+
+
+_DEFAULT_HANDLERS: Dict[type, Any] = {
+    ast.Constant: lambda node: node.value,
+    # Bare True/False/None parse as ast.Constant on modern Python; keep the
+    # name mapping for plain identifier defaults
+    ast.Name: lambda node: {"True": True, "False": False, "None": None}.get(
+        node.id, node.id
+    ),
+    ast.UnaryOp: _default_negative,
+    ast.List: lambda node: [],
+    ast.Dict: lambda node: {},
+    ast.Tuple: lambda node: (),
+}
+
+
+def _default_to_value(default_node: Any) -> Any:
+    """Extract a parameter's default value from its AST node"""
+    handler = _DEFAULT_HANDLERS.get(type(default_node))
+    return handler(default_node) if handler is not None else None
+
+
+# Sentinel so store lookups can distinguish "ref missing" from a stored None
+_MISSING = object()
+
+# Module names that must not be mistaken for a node's entry function when
+# falling back to "first callable in namespace"
+_NON_ENTRY_NAMES = frozenset({
+    "json",
+    "sys",
+    "traceback",
+    "inspect",
+    "math",
+    "datetime",
+    "pandas",
+    "pd",
+    "numpy",
+    "np",
+})
+
+# Safe builtins - remove dangerous functions
+_SAFE_BUILTIN_NAMES = frozenset({
+    "abs",
+    "all",
+    "any",
+    "bool",
+    "dict",
+    "enumerate",
+    "filter",
+    "float",
+    "int",
+    "len",
+    "list",
+    "map",
+    "max",
+    "min",
+    "print",
+    "range",
+    "round",
+    "set",
+    "sorted",
+    "str",
+    "sum",
+    "tuple",
+    "type",
+    "zip",
+    "isinstance",
+    "hasattr",
+    "getattr",
+    "setattr",
+    "repr",
+    "hash",
+    "id",
+    "iter",
+    "next",
+    "reversed",
+    "__build_class__",
+    "property",
+    "classmethod",
+    "staticmethod",
+    "super",
+    "object",
+    "Exception",
+    "ValueError",
+    "TypeError",
+    "AttributeError",
+    "KeyError",
+    "IndexError",
+    "RuntimeError",
+    "__import__",  # Allow importing modules within node code
+})
+
+import builtins as _builtins
+
+_SAFE_BUILTINS = {
+    k: getattr(_builtins, k) for k in _SAFE_BUILTIN_NAMES if hasattr(_builtins, k)
+}
+
+# Template namespace for node execution, resolved once instead of re-importing
+# every stdlib module on each node call. Don't import pandas/numpy here - let
+# nodes import them if needed; this avoids import errors affecting all nodes.
+_BASE_NAMESPACE = {
+    "__name__": "__main__",  # Required for class definitions
+    # Standard libraries
+    "json": __import__("json"),
+    "math": __import__("math"),
+    "datetime": __import__("datetime"),
+    "time": __import__("time"),
+    "random": __import__("random"),
+    "re": __import__("re"),
+    "collections": __import__("collections"),
+    "itertools": __import__("itertools"),
+    "Path": __import__("pathlib").Path,  # Add Path for file operations
+    "pathlib": __import__("pathlib"),
+    "os": __import__("os"),
+    "sys": __import__("sys"),
+    "asyncio": __import__("asyncio"),
+    "tempfile": __import__("tempfile"),
+}
+
+
+class EnhancedFlowExecutor(FlowExecutor):
+    """Enhanced Flow Executor that supports Python object passing between nodes"""
+
+    # Display configuration
+    MAX_DISPLAY_LENGTH = 30000  # Maximum characters to display in Result Node
+
+    # Object store bound: oldest references are evicted past this many
+    # entries so long-running services don't accumulate RSS across runs
+    MAX_STORE_ENTRIES = 1000
+
+    # Memoized results for nodes tagged @pure (see _analyze_node_code)
+    MAX_PURE_CACHE_ENTRIES = 512
+
+    # Bound on the disk memo tier. Each @pure blob's name bakes in the node
+    # file's mtime, so edits strand old blobs; pruning keeps .memo from
+    # growing without limit. Checked every _MEMO_PRUNE_INTERVAL writes.
+    MAX_MEMO_DISK_ENTRIES = 1024
+    _MEMO_PRUNE_INTERVAL = 64
+
+    # How long a get_store_info snapshot stays valid between store writes,
+    # so frontend polling can't turn the debug endpoint into an O(n) loop
+    STORE_INFO_TTL_SEC = 0.2
+
+    def __init__(self, projects_root: str):
+        super().__init__(projects_root)
+        # Object store for Python objects that can't be JSON serialized.
+        # Flat dict keyed on (project_id, ref_id): one hash lookup per access
+        # and no per-project inner dict to allocate or chase. Ordered so
+        # the least recently used reference is evicted first
+        self.object_store = OrderedDict()  # {(project_id, ref_id): object}
+        # Compiled node code keyed by file path; invalidated via mtime so
+        # repeated flow runs skip the lex/parse/compile of unchanged files
+        self._code_cache = {}  # {file_path: (mtime_ns, code_object, entry_fn, is_pure, is_cpu_bound)}
+        # Serialized results for @pure nodes keyed by
+        # (file_path, mtime_ns, canonical input bytes); LRU-bounded, with a
+        # disk tier under the projects root that survives restarts
+        self._pure_result_cache = OrderedDict()
+        self._memo_dir = self.projects_root / ".memo"
+        self._memo_writes = 0  # writes since the disk tier was last pruned
+        # get_store_info snapshots: {project_id: (monotonic time, info)}
+        self._store_info_cache = {}
+        # Monotonic suffix for reference IDs; unlike a millisecond timestamp
+        # two stores in quick succession can never collide
+        self._ref_counter = itertools.count()
+        # inspect.signature is slow reflection; memoize per function object.
+        # Weak keys so signatures die with the namespace that defined them.
+        self._sig_cache = weakref.WeakKeyDictionary()
+        # Flow plans keyed by (project_id, structure mtime_ns, start_node_id)
+        self._plan_cache = {}
+        # analyze_node_signature results keyed by file path, mtime-validated
+        self._signature_cache = {}  # {file_path: (mtime_ns, result)}
+        # Dedicated pool for blocking node execution. Node calls are mostly
+        # I/O-bound (LLM/HTTP), so size past cpu_count and don't share the
+        # loop's default executor with unrelated library work
+        self._node_executor = ThreadPoolExecutor(
+            max_workers=max(4, (os.cpu_count() or 1) * 2),
+            thread_name_prefix="flow-node",
+        )
+        # Last AIM_REDLAB_PATH value applied to sys.path; re-stat only when
+        # the env var actually changes instead of on every node execution
+        self._redlab_env: Optional[str] = None
+
+    def _ensure_redlab_path(self) -> None:
+        """Add AIM-RedLab to Python path for imports"""
+        path = os.environ.get(
+            "AIM_REDLAB_PATH", "/Users/kwontaeyoun/Desktop/AIM/AIM-RedLab"
+        )
+        if path == self._redlab_env:
+            return
+        self._redlab_env = path
+        if os.path.exists(path) and path not in sys.path:
+            sys.path.insert(0, path)
+
+    def _flow_plan(self, project_id: str, start_node_id: Optional[str]) -> FlowPlan:
+        """Build (or reuse) the execution plan for a project flow"""
+
+        structure_file = self.projects_root / project_id / "structure.json"
+        try:
+            mtime_ns = structure_file.stat().st_mtime_ns
+        except OSError:
+            raise FileNotFoundError(f"Project {project_id} not found")
+
+        key = (project_id, mtime_ns, start_node_id)
+        plan = self._plan_cache.get(key)
+        if plan is not None:
+            return plan
+
+        nodes, raw_edges = self._load_structure(project_id)
+        edges = [
+            Edge(
+                source=edge["source"],
+                target=edge["target"],
+                source_handle=edge.get("sourceHandle"),
+                target_handle=edge.get("targetHandle"),
+                param=edge.get("data", {}).get("param") if edge.get("data") else None,
+            )
+            for edge in raw_edges
+        ]
+
+        resolved_start = start_node_id
+        if not resolved_start:
+            resolved_start = self._find_start_node(nodes)
+            if not resolved_start:
+                raise ValueError("No start node found in project")
+
+        if resolved_start not in nodes:
+            raise ValueError(f"Start node {resolved_start} not found")
+
+        reachable_nodes, adjacency = self._extract_reachable_subgraph(
+            resolved_start, nodes, edges
+        )
+        execution_order = self._topological_sort(reachable_nodes, adjacency)
+
+        dependencies = defaultdict(set)
+        incoming_by_target = defaultdict(list)
+        for edge in edges:
+            incoming_by_target[edge.target].append(edge)
+            if edge.source in reachable_nodes and edge.target in reachable_nodes:
+                dependencies[edge.target].add(edge.source)
+
+        # Classify nodes once per structure version.
+        # Main processing components (everything except start/result/text
+        # input nodes) drive the streaming progress counter
+        main_component_indices = {}
+        for node_id in execution_order:
+            node = nodes.get(node_id, {})
+            node_type = node.get("type", "custom")
+            node_title = node.get("data", {}).get("title", "")
+            component_type = node.get("data", {}).get("componentType", "")
+
+            is_main_component = (
+                node_type not in ["start", "result", "textInput"]
+                and component_type != "TextInput"
+                and "Text Input" not in node_title
+                and "Start Node" not in node_title
+                and "Result Node" not in node_title
+            )
+            if is_main_component:
+                main_component_indices[node_id] = len(main_component_indices)
+
+        # Result nodes split by whether this pipeline feeds them:
+        # input Result nodes keep their values, output ones are cleared
+        input_result_nodes = []
+        output_result_nodes = []
+        for node_id in reachable_nodes:
+            if nodes.get(node_id, {}).get("type") == "result":
+                has_incoming = any(
+                    edge.source in reachable_nodes
+                    for edge in incoming_by_target.get(node_id, ())
+                )
+                if has_incoming:
+                    output_result_nodes.append(node_id)
+                else:
+                    input_result_nodes.append(node_id)
+
+        plan = FlowPlan(
+            nodes=nodes,
+            edges=edges,
+            start_node_id=resolved_start,
+            reachable_nodes=reachable_nodes,
+            adjacency=adjacency,
+            execution_order=execution_order,
+            # Plans are cached and shared across runs, so freeze the builder
+            # defaultdicts into plain dicts of tuples: immutable values and
+            # no silent growth from defaultdict access on missing keys
+            dependencies={
+                target: tuple(deps) for target, deps in dependencies.items()
+            },
+            incoming_by_target=dict(incoming_by_target),
+            main_component_indices=main_component_indices,
+            input_result_nodes=input_result_nodes,
+            output_result_nodes=output_result_nodes,
+        )
+        if len(self._plan_cache) >= 64:
+            self._plan_cache.clear()
+        self._plan_cache[key] = plan
+        return plan
+
+    def _execute_node_isolated(
+        self,
+        project_id: str,
+        node_id: str,
+        node_data: Dict,
+        input_data: Any,
+        timeout: int = 30,
+        target_handles: Optional[
+            Dict[str, str]
+        ] = None,  # Map of source_id -> target_handle
+        result_node_values: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Execute node in the same process to enable object passing"""
+
+        node_type = node_data.get("type", "custom")
+
+        # Handle start nodes
+        if node_type == "start":
+            return {
+                "status": "success",
+                "output": None,
+                "execution_time_ms": 0,
+                "logs": "Start node - flow initiated",
+            }
+
+        # Handle textInput nodes - check componentType first, then legacy title check
+        component_type = node_data.get("data", {}).get("componentType", "")
+        is_text_input = (
+            node_type == "textInput"
+            or component_type == "TextInput"
+            or (
+                node_type == "custom"
+                and node_data.get("data", {}).get("title", "").startswith("Text Input")
+            )
+        )
+
+        if is_text_input:
+            # TextInput nodes always use their stored value from localStorage (passed via result_node_values)
+            stored_value = (
+                result_node_values.get(node_id) if result_node_values else None
+            )
+
+            # Frontend sends the value directly as a string (not wrapped)
+            # But if it comes as dict for some reason, unwrap it
+            if isinstance(stored_value, dict):
+                # Could be {'value': actual_value} or {'display': ..., 'raw_value': ...}
+                if "value" in stored_value:
+                    stored_value = stored_value["value"]
+                elif "raw_value" in stored_value:
+                    stored_value = stored_value["raw_value"]
+                elif "display" in stored_value:
+                    stored_value = stored_value["display"]
+
+            pass  # TextInput node value stored
+
+            if stored_value is not None and stored_value != "":
+                # Return the stored value directly as a string (not wrapped in dict)
+                # This allows it to be used directly as parameter values
+                return {
+                    "status": "success",
+                    "output": stored_value,  # Direct string value, not wrapped
+                    "execution_time_ms": 0,
+                    "logs": "Text Input node - using stored value",
+                }
+            else:
+                # No stored value, return empty string
+                return {
+                    "status": "success",
+                    "output": "",  # Empty string, not wrapped
+                    "execution_time_ms": 0,
+                    "logs": "Text Input node - no stored value",
+                }
+
+        # Handle result nodes
+        if node_type == "result":
+            # Check if there's a stored value for this result node
+            stored_value = (
+                result_node_values.get(node_id) if result_node_values else None
+            )
+
+            # Determine if we should use stored value or new input
+            # If we have new input (this Result node receives data from upstream nodes), use it
+            # If no new input but we have stored value (this Result node is being used as input), use stored value
+            if input_data is not None:
+                # We have new input from upstream nodes, this will update the stored value
+                # If input is a dict with single key like {"input_18": value}, unwrap it
+                if isinstance(input_data, dict) and len(input_data) == 1:
+                    key = list(input_data.keys())[0]
+                    if key.startswith("input_"):
+                        input_data = input_data[key]
+
+                # Check if the input is an error from upstream node
+                if isinstance(input_data, dict) and input_data.get("_error") == True:
+                    # This is an error from upstream, return it as error status
+                    return {
+                        "status": "error",
+                        "error": input_data.get(
+                            "error", "Unknown error from upstream node"
+                        ),
+                        "logs": input_data.get("logs", ""),
+                        "execution_time_ms": 0,
+                        "output": None,
+                    }
+            elif stored_value is not None:
+                # No new input, but we have a stored value from previous execution
+                # This Result node is being used as an input source
+                input_data = stored_value
+            else:
+                # No input and no stored value
+                input_data = ""
+
+            # Wrap non-JSON serializable objects as references
+            input_data = self._wrap_output(project_id, node_id, input_data)
+
+            # Prepare both display and full data
+            display_output = input_data
+            full_data_ref = None
+
+            # Handle reference objects specially for Result nodes (reference
+            # wrappers are always plain dicts, see _store_as_reference)
+            if type(input_data) is dict and input_data.get("type") == "reference":
+                # Store the reference for full data access
+                full_data_ref = input_data.get("ref")
+
+                # Unwrap the reference to get actual value
+                unwrapped = self._unwrap_input(project_id, input_data)
+
+                # Apply size limit to prevent huge outputs
+                if isinstance(unwrapped, str):
+                    display_output = unwrapped[: self.MAX_DISPLAY_LENGTH] + (
+                        "..." if len(unwrapped) > self.MAX_DISPLAY_LENGTH else ""
+                    )
+                elif isinstance(unwrapped, (dict, list)):
+                    # Convert to JSON for readable display
+                    try:
+                        json_str, truncated = self._truncated_display(
+                            unwrapped, self.MAX_DISPLAY_LENGTH
+                        )
+                        display_output = json_str + ("..." if truncated else "")
+                    except:
+                        # Fallback to string representation
+                        display_output = str(unwrapped)[: self.MAX_DISPLAY_LENGTH]
+                else:
+                    display_output = str(unwrapped)[: self.MAX_DISPLAY_LENGTH]
+            else:
+                # Not a reference, check if it needs truncation
+                if (
+                    isinstance(input_data, str)
+                    and len(input_data) > self.MAX_DISPLAY_LENGTH
+                ):
+                    display_output = input_data[: self.MAX_DISPLAY_LENGTH] + "..."
+                elif isinstance(input_data, (dict, list)):
+                    try:
+                        json_str, truncated = self._truncated_display(
+                            input_data, self.MAX_DISPLAY_LENGTH
+                        )
+                        display_output = json_str + ("..." if truncated else "")
+                    except:
+                        display_output = str(input_data)[: self.MAX_DISPLAY_LENGTH]
+
+            # For ResultNode, we need to pass through the actual value
+            # while also providing display information
+            # The output should be the actual value (for pass-through)
+            # with display metadata attached
+
+            # Pass through the actual input data as output
+            # so it can be used by downstream nodes
+            # Keep it as reference if it was wrapped
+            actual_output = input_data
+
+            # Create display metadata for frontend
+            display_metadata = {
+                "display": display_output,
+                "full_ref": full_data_ref,
+                "is_truncated": isinstance(display_output, str)
+                and display_output.endswith("..."),
+            }
+
+            # Store display metadata in a special key that frontend can recognize
+            # but pass the actual value as the main output
+            return {
+                "status": "success",
+                "output": actual_output,  # Pass through the reference (not unwrapped)
+                "display_metadata": display_metadata,  # Metadata for UI display
+                "execution_time_ms": 0,
+                "logs": "Result node - passing through data",
+            }
+
+        # Handle custom nodes with in-process execution
+        try:
+            start_time = time.monotonic()
+
+            # 1. Unwrap input data (convert references to actual objects)
+            actual_input = self._unwrap_input(project_id, input_data)
+
+            # 2. If we have target handle information, restructure input for RunScript
+            # Check if input_data already has handle names as keys (from multi-input scenario)
+            # In that case, it's already properly structured and we don't need to restructure
+            if target_handles and isinstance(actual_input, dict):
+                # Check if the keys are already handle names (not source IDs)
+                handle_values = set(target_handles.values())
+                input_keys = set(actual_input.keys())
+
+                if input_keys == handle_values or input_keys.issubset(handle_values):
+                    # Input is already structured with handle names, don't restructure
+                    pass
+                else:
+                    # Input has source IDs as keys, need to restructure
+                    restructured_input = {}
+                    for source_id, value in actual_input.items():
+                        if source_id in target_handles:
+                            # Use the target handle as the parameter name
+                            handle_name = target_handles[source_id]
+                            restructured_input[handle_name] = value
+                        else:
+                            # Keep original key if no handle mapping
+                            restructured_input[source_id] = value
+                    actual_input = restructured_input
+            elif target_handles and len(target_handles) == 1:
+                # Single input with target handle - wrap in dict with handle name
+                handle_name = list(target_handles.values())[0]
+                if handle_name:
+                    actual_input = {handle_name: actual_input}
+
+            # 3. Execute node code. Nodes tagged @cpu_bound run in a separate
+            # interpreter via the parent class's subprocess path so they
+            # don't hold this process's GIL; that requires JSON-serializable
+            # input, otherwise they fall back to the in-process path
+            if self._is_cpu_bound_node(project_id, node_id, node_data) and (
+                actual_input is None or _canonical_dumps(actual_input) is not None
+            ):
+                sub_result = super()._execute_node_isolated(
+                    project_id, node_id, node_data, actual_input, timeout
+                )
+                if sub_result.get("status") == "success":
+                    sub_result["output"] = self._wrap_output(
+                        project_id, node_id, sub_result["output"]
+                    )
+                return sub_result
+
+            result = self._execute_in_process(
+                project_id, node_id, node_data, actual_input
+            )
+
+            # 4. Wrap output (store objects and return references if needed)
+            wrapped_output = self._wrap_output(project_id, node_id, result)
+
+            execution_time_ms = round((time.monotonic() - start_time) * 1000)
+
+            return {
+                "status": "success",
+                "output": wrapped_output,
+                "execution_time_ms": execution_time_ms,
+                "logs": "",
+            }
+
+        except Exception as e:
+            error_msg = str(e)
+            full_traceback = traceback.format_exc()
+
+            # for debugging
+            # print(f"\n{'='*60}")
+            # print(f"🔴 NODE EXECUTION ERROR - Node: {node_id}")
+            # print(f"{'='*60}")
+            # print(f"Error Type: {type(e).__name__}")
+            # print(f"Error Message: {error_msg}")
+            # print(f"\nFull Traceback:")
+            # print(full_traceback)
+            # print('='*60 + '\n')
+
+            return {
+                "status": "error",
+                "error": error_msg,
+                "execution_time_ms": 0,
+                "logs": full_traceback,
+            }
+
+    @staticmethod
+    def _analyze_node_code(node_code: str) -> Tuple[Optional[str], bool, bool]:
+        """Resolve the entry function (RunScript > main > first) and markers.
+
+        Nodes opt into behaviors via docstring tags on the module or entry
+        function: ``@pure`` enables result memoization (see
+        _execute_in_process) and ``@cpu_bound`` routes execution to a separate
+        interpreter process (see _execute_node_isolated).
+        """
+        try:
+            tree = ast.parse(node_code)
+        except SyntaxError:
+            return None, False, False
+
+        first: Optional[ast.FunctionDef] = None
+        main_def: Optional[ast.FunctionDef] = None
+        entry_def: Optional[ast.FunctionDef] = None
+        for stmt in tree.body:
+            if isinstance(stmt, ast.FunctionDef):
+                if stmt.name == "RunScript":
+                    entry_def = stmt
+                    break
+                if stmt.name == "main":
+                    main_def = stmt
+                elif first is None and not stmt.name.startswith("_"):
+                    first = stmt
+        if entry_def is None:
+            entry_def = main_def if main_def is not None else first
+        if entry_def is None:
+            return None, False, False
+
+        docstrings = (ast.get_docstring(tree), ast.get_docstring(entry_def))
+        is_pure = any(doc and "@pure" in doc for doc in docstrings)
+        is_cpu_bound = any(doc and "@cpu_bound" in doc for doc in docstrings)
+        return entry_def.name, is_pure, is_cpu_bound
+
+    def _is_cpu_bound_node(
+        self, project_id: str, node_id: str, node_data: Dict
+    ) -> bool:
+        """Whether the node opted into subprocess execution via @cpu_bound"""
+        file_path = self._resolve_node_file(
+            self.projects_root / project_id, node_id, node_data
+        )
+        try:
+            return self._cached_node_code(file_path)[4]
+        except (FileNotFoundError, SyntaxError):
+            # Let the in-process path surface its usual error
+            return False
+
+    @staticmethod
+    def _resolve_node_file(project_path: Path, node_id: str, node_data: Dict) -> Path:
+        """Resolve a node's source file path (explicit file or derived name)"""
+        file_name = node_data.get("data", {}).get("file")
+        if not file_name:
+            title = node_data.get("data", {}).get("title", f"Node_{node_id}")
+            sanitized_title = "".join(
+                c if c.isalnum() or c == "_" else "_" for c in title
+            )
+            file_name = f"{node_id}_{sanitized_title}.py"
+        return project_path / file_name
+
+    def _cached_node_code(
+        self, file_path: Path
+    ) -> Tuple[int, Any, Optional[str], bool, bool]:
+        """Compiled code and AST-derived markers, reused while mtime matches.
+
+        Returns (mtime_ns, code_object, entry_fn, is_pure, is_cpu_bound).
+        """
+        try:
+            mtime_ns = file_path.stat().st_mtime_ns
+        except OSError:
+            raise FileNotFoundError(f"Node file '{file_path.name}' not found")
+
+        cached = self._code_cache.get(file_path)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached
+
+        with open(file_path, "r", encoding="utf-8") as f:
+            node_code = f.read()
+        code_object = compile(node_code, str(file_path), "exec")
+        entry_fn, is_pure, is_cpu_bound = self._analyze_node_code(node_code)
+        cached = (mtime_ns, code_object, entry_fn, is_pure, is_cpu_bound)
+        self._code_cache[file_path] = cached
+        return cached
+
+    def _pure_cache_file(self, cache_key: Tuple[Path, int, bytes]) -> Path:
+        """Disk location for a @pure memo entry (content-addressed name)"""
+        file_path, mtime_ns, input_blob = cache_key
+        digest = hashlib.sha256()
+        digest.update(str(file_path).encode())
+        digest.update(str(mtime_ns).encode())
+        digest.update(input_blob)
+        return self._memo_dir / f"{digest.hexdigest()}.json"
+
+    def _read_pure_cache_file(self, cache_key: Tuple[Path, int, bytes]) -> Optional[bytes]:
+        """Load a memoized result blob from disk, None on any miss/error"""
+        try:
+            return self._pure_cache_file(cache_key).read_bytes()
+        except OSError:
+            return None
+
+    def _write_pure_cache_file(
+        self, cache_key: Tuple[Path, int, bytes], blob: bytes
+    ) -> None:
+        """Persist a memoized result blob; caching is best-effort only"""
+        try:
+            self._memo_dir.mkdir(parents=True, exist_ok=True)
+            self._pure_cache_file(cache_key).write_bytes(blob)
+        except OSError:
+            return
+        self._memo_writes += 1
+        if self._memo_writes >= self._MEMO_PRUNE_INTERVAL:
+            self._memo_writes = 0
+            self._prune_memo_dir()
+
+    def _prune_memo_dir(self) -> None:
+        """Drop the oldest memo blobs once the disk tier exceeds its budget"""
+        try:
+            entries = [
+                (entry.stat().st_mtime_ns, entry.path)
+                for entry in os.scandir(self._memo_dir)
+                if entry.is_file()
+            ]
+        except OSError:
+            return
+        excess = len(entries) - self.MAX_MEMO_DISK_ENTRIES
+        if excess <= 0:
+            return
+        entries.sort()
+        for _, stale_path in entries[:excess]:
+            try:
+                os.unlink(stale_path)
+            except OSError:
+                pass
+
+    def _execute_in_process(
+        self, project_id: str, node_id: str, node_data: Dict, input_data: Any
+    ) -> Any:
+        """Execute node code in the same process with a safe namespace"""
+
+        project_path = self.projects_root / project_id
+
+        try:
+            with venv_manager.activated(project_path):
+                self._ensure_redlab_path()
+
+                # Get node file path
+                file_path = self._resolve_node_file(project_path, node_id, node_data)
+                mtime_ns, code_object, entry_fn, is_pure, _ = self._cached_node_code(
+                    file_path
+                )
+
+                # Nodes tagged @pure are memoized on (file version, canonical
+                # input) - a hit skips the exec entirely. Results are kept
+                # serialized so a hit can't alias mutable output between runs
+                cache_key = None
+                if is_pure:
+                    input_blob = _canonical_dumps(input_data)
+                    if input_blob is not None:
+                        cache_key = (file_path, mtime_ns, input_blob)
+                        hit = self._pure_result_cache.get(cache_key, _MISSING)
+                        if hit is not _MISSING:
+                            self._pure_result_cache.move_to_end(cache_key)
+                            return _canonical_loads(hit)
+
+                        # Memory miss - check the disk tier so expensive pure
+                        # nodes stay warm across process restarts
+                        blob = self._read_pure_cache_file(cache_key)
+                        if blob is not None:
+                            self._pure_result_cache[cache_key] = blob
+                            return _canonical_loads(blob)
+
+                # Create safe execution namespace
+                namespace = self._create_safe_namespace(input_data)
+
+                # Execute the code
+                exec(code_object, namespace)
+
+                # Find and execute the main function
+                result = None
+                function_found = False
+
+                # Entry function resolved once from the AST at compile time;
+                # the namespace scan below stays as fallback for odd cases
+                # (e.g. entrypoints produced by conditionals or decorators)
+                entry = namespace.get(entry_fn) if entry_fn else None
+                if callable(entry):
+                    result = self._call_function_with_input(entry, input_data)
+                    function_found = True
+                # Priority: RunScript > main > first callable
+                elif "RunScript" in namespace and callable(namespace["RunScript"]):
+                    result = self._call_function_with_input(
+                        namespace["RunScript"], input_data
+                    )
+                    function_found = True
+                elif "main" in namespace and callable(namespace["main"]):
+                    result = self._call_function_with_input(
+                        namespace["main"], input_data
+                    )
+                    function_found = True
+                else:
+                    # Find first callable function
+                    for name, obj in namespace.items():
+                        if (
+                            callable(obj)
+                            and not name.startswith("_")
+                            and name not in _NON_ENTRY_NAMES
+                        ):
+                            result = self._call_function_with_input(obj, input_data)
+                            function_found = True
+                            break
+
+                if not function_found:
+                    raise RuntimeError("No callable function found in node")
+
+                if cache_key is not None:
+                    result_blob = _canonical_dumps(result)
+                    if result_blob is not None:
+                        self._pure_result_cache[cache_key] = result_blob
+                        while (
+                            len(self._pure_result_cache)
+                            > self.MAX_PURE_CACHE_ENTRIES
+                        ):
+                            self._pure_result_cache.popitem(last=False)
+                        self._write_pure_cache_file(cache_key, result_blob)
+
+                return result
+        except venv_manager.VenvError as exc:
+            raise RuntimeError(
+                f"Virtual environment not ready for project '{project_id}': {exc}"
+            ) from exc
+
+    def _create_safe_namespace(self, input_data: Any) -> Dict:
+        """Create a safe execution namespace with limited builtins"""
+
+        # The base namespace is built once at import time (see module level);
+        # per call we only need fresh top-level dicts so node code mutating
+        # its namespace can't leak into other nodes
+        namespace = _BASE_NAMESPACE.copy()
+        namespace["__builtins__"] = dict(_SAFE_BUILTINS)
+        namespace["input_data"] = input_data
+        return namespace
+
+    def _call_plan(self, func: callable) -> Tuple[Tuple[str, ...], frozenset]:
+        """Parameter names and required-parameter set for a function.
+
+        Computed from inspect.signature once per function object so the
+        steady-state call path is dict slicing, not reflection.
+        """
+        try:
+            return self._sig_cache[func]
+        except (KeyError, TypeError):
+            pass
+
+        sig = inspect.signature(func)
+        params = tuple(sig.parameters)
+        required = frozenset(
+            name
+            for name, param in sig.parameters.items()
+            if param.default is inspect.Parameter.empty
+        )
+        plan = (params, required)
+        try:
+            self._sig_cache[func] = plan
+        except TypeError:
+            pass  # non-weakrefable callables (e.g. builtins)
+        return plan
+
+    def _call_function_with_input(self, func: callable, input_data: Any) -> Any:
+        """Call a function with appropriate input handling for RunScript pattern"""
+
+        try:
+            params, required = self._call_plan(func)
+
+            # No parameters - call without arguments
+            if len(params) == 0:
+                return func()
+
+            # Special handling for RunScript pattern
+            if func.__name__ == "RunScript":
+                # RunScript always uses keyword arguments from input_data dict
+                if isinstance(input_data, dict):
+                    # Pass through the parameters present in input_data;
+                    # missing ones fall back to Python's default behavior
+                    return func(
+                        **{name: input_data[name] for name in params if name in input_data}
+                    )
+                else:
+                    # If input is not a dict, try to pass as first parameter only
+                    first_param = params[0] if params else None
+                    if first_param:
+                        return func(**{first_param: input_data})
+                    else:
+                        return func()
+
+            # For non-RunScript functions, use original logic
+            # If input is a dict and function expects multiple parameters
+            if isinstance(input_data, dict) and len(params) > 1:
+                # Required parameter missing -> fall back to single argument
+                if not required <= input_data.keys():
+                    return func(input_data)
+                return func(
+                    **{name: input_data[name] for name in params if name in input_data}
+                )
+
+            # Single parameter or non-dict input
+            if input_data is not None:
+                return func(input_data)
+            else:
+                return func()
+
+        except TypeError as e:
+            # Handle parameter mismatch errors only
+            # Don't retry for RunScript functions - they should always use kwargs
+            if func.__name__ == "RunScript":
+                raise
+
+            if "missing" in str(e) and "required positional argument" in str(e):
+                # Try calling with no arguments if it's expecting nothing
+                try:
+                    return func()
+                except:
+                    pass
+
+            # Fallback: try calling with input_data or without
+            if input_data is not None:
+                return func(input_data)
+            else:
+                return func()
+        except Exception:
+            # For any other exception (ZeroDivisionError, ValueError, etc.)
+            # Don't retry - just raise the original exception
+            raise
+
+    @staticmethod
+    def _contains_reference(data: Any) -> bool:
+        """Check whether any reference dict exists anywhere in the structure.
+
+        Iterative scan so unwrapping can return ref-free inputs unchanged
+        instead of rebuilding every nested dict/list.
+        """
+        worklist = deque([data])
+        while worklist:
+            current = worklist.popleft()
+            if isinstance(current, dict):
+                if current.get("type") == "reference" and "ref" in current:
+                    return True
+                worklist.extend(current.values())
+            elif isinstance(current, list):
+                worklist.extend(current)
+        return False
+
+    def _unwrap_input(self, project_id: str, data: Any) -> Any:
+        """Convert references to actual objects from the object store"""
+
+        if data is None:
+            return None
+
+        # No references anywhere - return as-is without copying. Otherwise
+        # _unwrap_refs preserves the identity of ref-free branches, so only
+        # the paths leading to a reference get rebuilt.
+        if isinstance(data, (dict, list)) and not self._contains_reference(data):
+            return data
+
+        return self._unwrap_refs(data, project_id)
+
+    def _unwrap_refs(self, data: Any, project_id: str) -> Any:
+        """Recursive unwrap helper resolving references from the flat store"""
+
+        # Handle reference objects
+        if isinstance(data, dict):
+            # Check if this is a reference object
+            if data.get("type") == "reference" and "ref" in data:
+                key = (project_id, data["ref"])
+                obj = self.object_store.get(key, _MISSING)
+                if obj is _MISSING:
+                    # Reference not found - return preview if available
+                    return data.get("preview", None)
+                self.object_store.move_to_end(key)  # keep hot refs resident
+                return obj
+
+            # Recursively unwrap dict values; if no value changed, hand back
+            # the original dict so ref-free branches keep their identity
+            # (copy-on-write style path copying)
+            changed = False
+            unwrapped = {}
+            for key, value in data.items():
+                new_value = self._unwrap_refs(value, project_id)
+                if new_value is not value:
+                    changed = True
+                unwrapped[key] = new_value
+            return unwrapped if changed else data
+
+        # Handle lists the same way
+        if isinstance(data, list):
+            changed = False
+            unwrapped_list = []
+            for item in data:
+                new_item = self._unwrap_refs(item, project_id)
+                if new_item is not item:
+                    changed = True
+                unwrapped_list.append(new_item)
+            return unwrapped_list if changed else data
+
+        # Return as-is for primitive types
+        return data
+
+    @classmethod
+    def _truncated_display(cls, data: Any, limit: int) -> Tuple[str, bool]:
+        """Serialize data for display, stopping once ``limit`` chars exist.
+
+        Returns (text, truncated). Small payloads take one fast C-encoder
+        pass; large ones use the incremental stdlib encoder so a huge blob
+        costs O(limit) instead of a full serialize that gets sliced away.
+        """
+        if cls._estimated_json_size(data, limit * 2) < limit * 2:
+            text = _display_dumps(data)
+            return text[:limit], len(text) > limit
+
+        buf: List[str] = []
+        total = 0
+        for chunk in json.JSONEncoder(indent=2, ensure_ascii=False).iterencode(data):
+            buf.append(chunk)
+            total += len(chunk)
+            if total > limit:
+                return "".join(buf)[:limit], True
+        return "".join(buf), False
+
+    @classmethod
+    def _estimated_json_size(cls, data: Any, limit: int) -> int:
+        """Cheaply estimate the JSON-encoded size of ``data``, capped at limit.
+
+        Returns a value >= limit as soon as the running estimate exceeds it,
+        so huge outputs never pay a full serialization just to be discarded
+        in favour of a reference.
+        """
+        if data is None or isinstance(data, bool):
+            return 5
+        if isinstance(data, (int, float)):
+            return len(str(data))
+        if isinstance(data, str):
+            return len(data) + 2
+        if isinstance(data, (list, tuple)):
+            total = 2
+            for item in data:
+                total += cls._estimated_json_size(item, limit) + 1
+                if total >= limit:
+                    return total
+            return total
+        if isinstance(data, dict):
+            total = 2
+            for key, value in data.items():
+                total += len(str(key)) + 4
+                total += cls._estimated_json_size(value, limit) + 1
+                if total >= limit:
+                    return total
+            return total
+        # Unknown type - not JSON serializable anyway, force the reference path
+        return limit
+
+    def _wrap_output(self, project_id: str, node_id: str, data: Any) -> Any:
+        """Wrap output data - use JSON for small data, references for large/complex objects"""
+
+        # Primitive types pass through directly
+        if data is None or isinstance(data, (bool, int, float, str)):
+            return data
+
+        # Already a reference (e.g. a Result node passing one through) - keep
+        # it as-is instead of serializing the wrapper dict again
+        if type(data) is dict and data.get("type") == "reference" and "ref" in data:
+            return data
+
+        # Cheap size estimate first: clearly-large outputs go straight to the
+        # reference store without paying a full (then discarded) serialization
+        if self._estimated_json_size(data, 10000) < 10000:
+            # The C encoder walks the object once and produces compact bytes;
+            # only the size gate changes, the returned data stays identical
+            try:
+                if orjson is not None:
+                    encoded_size = len(
+                        orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+                    )
+                else:
+                    encoded_size = len(json.dumps(data))
+                # If serializable and under 10KB, return directly
+                if encoded_size < 10000:
+                    return data
+            except (TypeError, ValueError):
+                # Not JSON serializable, need to use reference
+                pass
+
+        # Store as reference for large or complex objects
+        return self._store_as_reference(project_id, node_id, data)
+
+    def _store_as_reference(self, project_id: str, node_id: str, data: Any) -> Dict:
+        """Store an object and return a reference"""
+
+        # Generate unique reference ID
+        ref_id = f"{node_id}_{next(self._ref_counter)}"
+
+        # Store the object, evicting the least recently used references
+        # once the store exceeds its bound
+        self.object_store[(project_id, ref_id)] = data
+        while len(self.object_store) > self.MAX_STORE_ENTRIES:
+            self.object_store.popitem(last=False)
+        # Eviction may touch any project's entries, so drop all snapshots
+        self._store_info_cache.clear()
+
+        # Return reference with metadata
+        return {
+            "type": "reference",
+            "ref": ref_id,
+            "preview": self._generate_preview(data),
+            "data_type": type(data).__name__,
+            "size": _cheap_size(data),
+        }
+
+    def _generate_preview(self, data: Any) -> str:
+        """Generate a human-readable preview of the data"""
+
+        try:
+            # pandas DataFrame
+            if hasattr(data, "shape") and hasattr(data, "columns"):
+                return f"DataFrame: {data.shape[0]} rows × {data.shape[1]} cols"
+
+            # numpy array
+            elif hasattr(data, "shape") and hasattr(data, "ndim"):
+                return f"Array: shape={data.shape}, dtype={data.dtype}"
+
+            # List or tuple
+            elif isinstance(data, (list, tuple)):
+                preview = f"{type(data).__name__} with {len(data)} items"
+                if len(data) > 0:
+                    preview += f" (first: {str(data[0])[:50]})"
+                return preview
+
+            # Dictionary
+            elif isinstance(data, dict):
+                keys = list(data.keys())[:3]
+                preview = f"Dict with {len(data)} keys"
+                if keys:
+                    preview += f" ({', '.join(str(k) for k in keys)}{'...' if len(data) > 3 else ''})"
+                return preview
+
+            # Set
+            elif isinstance(data, set):
+                return f"Set with {len(data)} items"
+
+            # Custom objects
+            elif hasattr(data, "__class__"):
+                class_name = data.__class__.__name__
+                # Try to get a meaningful representation
+                if hasattr(data, "__len__"):
+                    return f"{class_name} ({len(data)} items)"
+                elif hasattr(data, "__str__"):
+                    str_repr = str(data)[:100]
+                    return f"{class_name}: {str_repr}{'...' if len(str(data)) > 100 else ''}"
+                else:
+                    return f"{class_name} object"
+
+            # Default: string representation
+            else:
+                preview = str(data)[:100]
+                if len(str(data)) > 100:
+                    preview += "..."
+                return preview
+
+        except Exception as e:
+            return f"{type(data).__name__} object (preview error: {str(e)[:50]})"
+
+    def cleanup_project_store(self, project_id: str):
+        """Clean up object store for a project"""
+
+        # Clear all references for this project
+        stale = [key for key in self.object_store if key[0] == project_id]
+        for key in stale:
+            del self.object_store[key]
+        self._store_info_cache.pop(project_id, None)
+
+    def _extract_reachable_subgraph(
+        self, start_id: str, nodes: Dict[str, Dict], edges: List[Edge]
+    ) -> Tuple[Set[str], Dict[str, List[Tuple[str, Optional[str]]]]]:
+        """Extract nodes reachable from start node, including nodes that provide inputs"""
+        # Index nodes once so the BFS runs over contiguous int lists with a
+        # bytearray visited mask instead of hashing string IDs at every step;
+        # string IDs are restored only at the return boundary
+        node_ids = list(nodes)
+        idx = {node_id: i for i, node_id in enumerate(node_ids)}
+
+        adjacency = defaultdict(list)
+        forward = [[] for _ in node_ids]
+        reverse = [[] for _ in node_ids]  # Track who provides input to whom
+
+        for edge in edges:
+            source = edge.source
+            target = edge.target
+
+            if source in idx and target in idx:
+                adjacency[source].append((target, edge.param))
+                forward[idx[source]].append(idx[target])
+                reverse[idx[target]].append(idx[source])
+
+        # BFS to find reachable nodes from start
+        visited = bytearray(len(node_ids))
+        queue = deque([idx[start_id]])
+
+        while queue:
+            current = queue.popleft()
+            if visited[current]:
+                continue
+            visited[current] = 1
+
+            # Add all nodes that current node connects to
+            for target in forward[current]:
+                if not visited[target]:
+                    queue.append(target)
+
+            # IMPORTANT: Also add nodes that provide input to the current node
+            # This ensures nodes like 7 and 8 that feed into node 6 are included
+            for source in reverse[current]:
+                if not visited[source]:
+                    queue.append(source)
+
+        reachable = {node_id for i, node_id in enumerate(node_ids) if visited[i]}
+        return reachable, adjacency
+
+    def _assemble_inputs(
+        self,
+        project_id: str,
+        node_data: Dict,
+        incoming_edges: List[Dict],
+        node_outputs: Dict,
+    ) -> Tuple[Any, Optional[Dict[str, str]]]:
+        """Build a node's input data and source->targetHandle map.
+
+        Shared by the batch and streaming executors; ``incoming_edges`` must
+        already be filtered to sources present in ``node_outputs``. The handle
+        map is None when no edge declares a targetHandle - the common case -
+        so callers don't pay a dict allocation per node for it.
+        """
+        # Always use dict format for consistency between single and multiple inputs
+        input_data: Any = {}
+        target_handles: Optional[Dict[str, str]] = None
+        is_result = node_data.get("type") == "result"
+        unwrap = self._unwrap_input
+
+        for edge in incoming_edges:
+            source = edge.source
+            source_output = node_outputs[source]
+
+            # Check if source_output is a reference and unwrap it first.
+            # Reference wrappers are always plain dicts built by
+            # _store_as_reference, so the exact-type check suffices and is
+            # cheaper than isinstance on this per-edge hot path
+            if (
+                type(source_output) is dict
+                and source_output.get("type") == "reference"
+            ):
+                source_output = unwrap(project_id, source_output)
+
+            # Extract value based on sourceHandle
+            value = source_output
+            source_handle = edge.source_handle
+            if (
+                source_handle
+                and isinstance(source_output, dict)
+                and source_handle in source_output
+            ):
+                # Extract specific output from dict
+                value = source_output[source_handle]
+
+            # Use targetHandle as key if specified
+            target_handle = edge.target_handle
+            if target_handle:
+                input_data[target_handle] = value
+                if target_handles is None:
+                    target_handles = {}
+                target_handles[source] = target_handle
+            elif is_result and not input_data:
+                # Result nodes without targetHandle get the value directly
+                input_data = value
+            else:
+                # Other nodes use a generic key
+                input_data[f"input_{source}"] = value
+
+        return input_data, target_handles
+
+    async def execute_flow(
+        self,
+        project_id: str,
+        start_node_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        result_node_values: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+        timeout_sec: int = 30,
+        halt_on_error: bool = True,
+    ) -> Dict[str, Any]:
+        """Execute the complete flow with targetHandle support"""
+
+        # Load (or reuse) the precomputed execution plan for this structure
+        plan = self._flow_plan(project_id, start_node_id)
+        nodes = plan.nodes
+        start_node_id = plan.start_node_id
+        execution_order = plan.execution_order
+        dependencies = plan.dependencies
+
+        # Initialize execution state
+        execution_results = {}
+        node_outputs = {}
+        node_inputs = defaultdict(dict)
+
+        # Set initial params for start node
+        if params:
+            node_inputs[start_node_id] = params
+
+        # Execution semaphore for parallel control
+        semaphore = asyncio.Semaphore(max_workers)
+
+        # Completion event per node so downstream tasks wait on dependencies
+        # without occupying a semaphore slot while doing so
+        node_done = {node_id: asyncio.Event() for node_id in execution_order}
+
+        async def execute_node_async(node_id: str):
+            """Execute a single node asynchronously"""
+            try:
+                # Wait for dependencies outside the semaphore so max_workers
+                # reflects nodes actually executing, not nodes waiting
+                for dep in dependencies.get(node_id, ()):
+                    await node_done[dep].wait()
+                    if (
+                        halt_on_error
+                        and execution_results.get(dep, {}).get("status") == "error"
+                    ):
+                        execution_results[node_id] = {
+                            "status": "skipped",
+                            "error": f"Skipped due to error in dependency {dep}",
+                            "execution_time_ms": 0,
+                            "logs": "",
+                        }
+                        return
+
+                await _run_node(node_id)
+            finally:
+                node_done[node_id].set()
+
+        async def _run_node(node_id: str):
+            """Prepare inputs and execute one node under the semaphore"""
+            async with semaphore:
+                # Prepare input data with targetHandle mapping
+                input_data = None
+                target_handles = None
+
+                # Collect inputs from edges whose sources have executed
+                incoming_edges = [
+                    edge
+                    for edge in plan.incoming_by_target.get(node_id, ())
+                    if edge.source in node_outputs
+                ]
+
+                if incoming_edges:
+                    input_data, target_handles = self._assemble_inputs(
+                        project_id, nodes.get(node_id, {}), incoming_edges, node_outputs
+                    )
+                elif node_id == start_node_id and params:
+                    # Start node with initial params
+                    input_data = params
+
+                # Execute node in thread pool (blocking operation)
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(
+                    self._node_executor,
+                    self._execute_node_isolated,
+                    project_id,
+                    node_id,
+                    nodes[node_id],
+                    input_data,
+                    timeout_sec,
+                    target_handles,
+                    result_node_values,
+                )
+
+                execution_results[node_id] = result
+
+                # Store output for downstream nodes
+                if result["status"] == "success":
+                    node_outputs[node_id] = result.get("output")
+
+        # Schedule every node at once; each task waits on its dependency
+        # events, so nodes start the moment their inputs are ready instead of
+        # in lock-stepped waves
+        await asyncio.gather(
+            *(execute_node_async(node_id) for node_id in execution_order)
+        )
+
+        # Collect results from result nodes
+        result_nodes = {}
+        for node_id in execution_results:
+            if nodes[node_id].get("type") == "result":
+                if execution_results[node_id]["status"] == "success":
+                    result_nodes[node_id] = execution_results[node_id]["output"]
+
+        return {
+            "success": True,
+            "run_id": f"{time.strftime('%Y-%m-%dT%H:%M:%SZ')}-{project_id}",
+            "execution_results": execution_results,
+            "result_nodes": result_nodes,
+            "execution_order": execution_order,
+            "total_execution_time_ms": sum(
+                r.get("execution_time_ms", 0)
+                for r in execution_results.values()
+                if r.get("status") == "success"
+            ),
+        }
+
+    async def execute_flow_streaming(
+        self,
+        project_id: str,
+        start_node_id: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None,
+        result_node_values: Optional[Dict[str, Any]] = None,
+        max_workers: int = 4,
+        timeout_sec: int = 30,
+        halt_on_error: bool = True,
+    ):
+        """Execute flow with streaming results - yields results as nodes complete"""
+
+        # Load project structure
+        # Load (or reuse) the precomputed execution plan for this structure
+        plan = self._flow_plan(project_id, start_node_id)
+        nodes = plan.nodes
+        edges = plan.edges
+        start_node_id = plan.start_node_id
+        reachable_nodes = plan.reachable_nodes
+        execution_order = plan.execution_order
+
+        # Initialize tracking (monotonic so elapsed time survives clock jumps)
+        start_time = time.monotonic()
+        execution_results = {}
+        node_outputs = {}
+        result_nodes = {}
+
+        # Execution control dictionary to share state between async tasks
+        execution_control = {
+            "stopped": False,
+            "error_node_id": None,
+            "error_node_title": None,
+        }
+
+        # Node classification (main components for the progress count, input
+        # vs output Result nodes) is precomputed with the plan
+        main_component_indices = plan.main_component_indices
+        main_component_count = len(main_component_indices)
+        input_result_nodes = plan.input_result_nodes
+        output_result_nodes = plan.output_result_nodes
+        completed_main_components = 0  # Track completed main components
+
+        # Send initial event with classified nodes
+        yield {
+            "type": "start",
+            "total_nodes": main_component_count,  # Use filtered count
+            "execution_order": execution_order,
+            "affected_nodes": list(reachable_nodes),  # All nodes in this pipeline
+            "input_result_nodes": input_result_nodes,  # Result nodes to preserve
+            "output_result_nodes": output_result_nodes,  # Result nodes to clear
+            "timestamp": time.time(),
+        }
+
+        # Dependencies come precomputed with the plan
+        dependencies = plan.dependencies
+
+        # Execute nodes with dependency-aware parallelism
+
+        completed_nodes = set()
+        completed_main_components = 0  # Track how many main components have completed
+
+        # Track nodes directly connected to error node to allow them to receive error
+        error_downstream_nodes = set()
+
+        # Completion-driven scheduler: the sorter hands out each node the
+        # moment its dependencies are marked done, so a slow node only delays
+        # its own descendants - not unrelated nodes in the same "wave"
+        sorter = graphlib.TopologicalSorter()
+        for node_id in execution_order:
+            sorter.add(node_id, *dependencies.get(node_id, ()))
+        sorter.prepare()
+
+        pending_tasks = set()
+        task_to_node = {}  # Map task to node_id for tracking
+
+        # Run-wide state every node task shares
+        run = _StreamRun(
+            project_id=project_id,
+            nodes=nodes,
+            incoming_by_target=plan.incoming_by_target,
+            node_outputs=node_outputs,
+            execution_results=execution_results,
+            result_nodes=result_nodes,
+            result_node_values=result_node_values,
+            start_node_id=start_node_id,
+            params=params,
+            timeout_sec=timeout_sec,
+            execution_control=execution_control,
+            total_main_components=main_component_count,
+        )
+
+        def schedule_node(node_id):
+            # Get the main component index for this node (or -1 if not a main component)
+            main_index = main_component_indices.get(node_id, -1)
+
+            task = asyncio.create_task(
+                self._execute_node_streaming(
+                    run, node_id, main_index, completed_main_components
+                )
+            )
+            pending_tasks.add(task)
+            task_to_node[task] = node_id
+
+        # Seed with the dependency-free nodes
+        for node_id in sorter.get_ready():
+            schedule_node(node_id)
+
+        while pending_tasks:
+            # Wait for at least one task to complete
+            done, pending_tasks = await asyncio.wait(
+                pending_tasks, return_when=asyncio.FIRST_COMPLETED
+            )
+
+            # Yield each finished node and immediately schedule whatever it
+            # unblocked while the remaining tasks keep running
+            for completed_task in done:
+                result = await completed_task
+                node_id = task_to_node.pop(completed_task)
+
+                if result:
+                    yield result
+                    # Track completed main components for accurate progress
+                    if node_id in main_component_indices:
+                        completed_main_components += 1
+
+                completed_nodes.add(node_id)
+                if not execution_control["stopped"]:
+                    sorter.done(node_id)
+                    for ready_id in sorter.get_ready():
+                        schedule_node(ready_id)
+
+        if execution_control["stopped"]:
+            # Identify Result nodes directly connected to the error node;
+            # only they may still run, to receive the error information
+            if execution_control["error_node_id"]:
+                for edge in edges:
+                    if edge.source == execution_control["error_node_id"]:
+                        target_node = nodes.get(edge.target, {})
+                        if target_node.get("type") == "result":
+                            error_downstream_nodes.add(edge.target)
+
+            # Skip everything else that has not run yet; one timestamp covers
+            # the whole batch of skip events
+            now = time.time()
+            for node_id in execution_order:
+                if (
+                    node_id not in completed_nodes
+                    and node_id not in error_downstream_nodes
+                ):
+                    node_data = nodes[node_id]
+
+                    # Create skipped result
+                    skipped_result = {
+                        "status": "skipped",
+                        "error": f"Execution stopped due to error in node: {execution_control['error_node_title']}",
+                        "execution_time_ms": 0,
+                        "logs": "",
+                        "skipped_reason": "upstream_error",
+                        "error_source": execution_control["error_node_id"],
+                    }
+
+                    execution_results[node_id] = skipped_result
+
+                    # Send skip event for main components
+                    if node_id in main_component_indices:
+                        yield {
+                            "type": "node_complete",
+                            "node_id": node_id,
+                            "node_title": node_data.get("data", {}).get(
+                                "title", "Unknown"
+                            ),
+                            "node_index": main_component_indices[node_id] + 1,
+                            "total_nodes": main_component_count,
+                            "result": skipped_result,
+                            "timestamp": now,
+                        }
+
+                    completed_nodes.add(node_id)
+
+            # Run the direct downstream nodes outside the sorter; their
+            # dependencies were either completed or just skipped above
+            for node_id in error_downstream_nodes:
+                if node_id not in completed_nodes:
+                    schedule_node(node_id)
+
+            while pending_tasks:
+                done, pending_tasks = await asyncio.wait(
+                    pending_tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for completed_task in done:
+                    result = await completed_task
+                    node_id = task_to_node.pop(completed_task)
+
+                    if result:
+                        yield result
+                        if node_id in main_component_indices:
+                            completed_main_components += 1
+
+                    completed_nodes.add(node_id)
+
+        # Send complete event
+        yield {
+            "type": "complete",
+            "execution_results": execution_results,
+            "result_nodes": result_nodes,
+            "execution_order": execution_order,
+            "total_execution_time_ms": round((time.monotonic() - start_time) * 1000),
+            "timestamp": time.time(),
+        }
+
+        return
+
+    async def _execute_node_streaming(
+        self,
+        run: _StreamRun,
+        node_id: str,
+        main_component_index: int,  # Index in main components (-1 if not a main component)
+        completed_main_components: int,  # Number of main components completed so far
+    ):
+        """Execute a single node and return streaming result"""
+        node_data = run.nodes[node_id]
+        node_outputs = run.node_outputs
+        total_main_components = run.total_main_components
+        try:
+            # Prepare input data
+            input_data = None
+            target_handles = None
+
+            # Collect inputs from edges whose sources have executed
+            incoming_edges = [
+                edge
+                for edge in run.incoming_by_target.get(node_id, ())
+                if edge.source in node_outputs
+            ]
+
+            if incoming_edges:
+                input_data, target_handles = self._assemble_inputs(
+                    run.project_id, node_data, incoming_edges, node_outputs
+                )
+            elif node_id == run.start_node_id and run.params:
+                input_data = run.params
+
+            # Execute node
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(
+                self._node_executor,
+                self._execute_node_isolated,
+                run.project_id,
+                node_id,
+                node_data,
+                input_data,
+                run.timeout_sec,
+                target_handles,
+                run.result_node_values,
+            )
+
+            run.execution_results[node_id] = result
+
+            # Store output for downstream nodes
+            if result["status"] == "success":
+                node_outputs[node_id] = result.get("output")
+
+                # Handle result nodes
+                if node_data.get("type") == "result":
+                    run.result_nodes[node_id] = result.get("output")
+            elif result["status"] == "error":
+                # Mark as primary error and stop execution
+                node_outputs[node_id] = {
+                    "_error": True,
+                    "error_type": "primary",
+                    "status": "error",
+                    "error": result.get("error"),
+                    "logs": result.get("logs"),
+                    "node_id": node_id,
+                }
+
+                # Set flag to stop execution
+                run.execution_control["stopped"] = True
+                run.execution_control["error_node_id"] = node_id
+                run.execution_control["error_node_title"] = node_data.get(
+                    "data", {}
+                ).get("title", "Unknown")
+
+            # Return node completion event
+            # Send updates for all nodes including Result nodes for real-time updates
+            # Only exclude Start and TextInput nodes from progress updates
+            if node_data.get("type") == "result":
+                # For Result nodes, send event but don't increment progress counter
+                # Use the current completed count (not incremented for Result nodes)
+                return {
+                    "type": "node_complete",
+                    "node_id": node_id,
+                    "node_title": node_data.get("data", {}).get("title", "Unknown"),
+                    "node_index": completed_main_components,  # Use current progress
+                    "total_nodes": total_main_components,
+                    "result": result,
+                    "timestamp": time.time(),
+                }
+            elif main_component_index >= 0:
+                # For main components, use their actual index
+                return {
+                    "type": "node_complete",
+                    "node_id": node_id,
+                    "node_title": node_data.get("data", {}).get("title", "Unknown"),
+                    "node_index": main_component_index + 1,  # 1-based index for display
+                    "total_nodes": total_main_components,
+                    "result": result,
+                    "timestamp": time.time(),
+                }
+            else:
+                # For auxiliary nodes (start, text input), don't send progress update
+                return None
+
+        except Exception as e:
+            # Return error event
+            error_result = {
+                "status": "error",
+                "error": str(e),
+                "execution_time_ms": 0,
+                "logs": "",
+            }
+            run.execution_results[node_id] = error_result
+
+            # Only send error events for main components
+            if main_component_index >= 0:
+                return {
+                    "type": "node_complete",
+                    "node_id": node_id,
+                    "node_title": node_data.get("data", {}).get("title", "Unknown"),
+                    "node_index": main_component_index + 1,
+                    "total_nodes": total_main_components,
+                    "result": error_result,
+                    "timestamp": time.time(),
+                }
+            else:
+                return None
+
+    def get_store_info(self, project_id: str) -> Dict:
+        """Get information about the object store for debugging"""
+
+        # Serve a recent snapshot while the store is unchanged; polling
+        # clients otherwise rescan every entry per request
+        now = time.monotonic()
+        cached = self._store_info_cache.get(project_id)
+        if cached is not None and now - cached[0] < self.STORE_INFO_TTL_SEC:
+            return cached[1]
+
+        refs = [
+            {
+                "ref": key[1],
+                "type": type(obj).__name__,
+                "size": sys.getsizeof(obj),
+            }
+            for key, obj in self.object_store.items()
+            if key[0] == project_id
+        ]
+        if not refs:
+            info = {"exists": False, "count": 0, "refs": []}
+        else:
+            info = {
+                "exists": True,
+                "count": len(refs),
+                "refs": refs,
+            }
+        self._store_info_cache[project_id] = (now, info)
+        return info
+
+    def analyze_node_signature(
+        self, project_id: str, node_id: str, node_data: Dict
+    ) -> Dict:
+        """Analyze a node's RunScript function signature for metadata"""
+
+        try:
+            # Get node file path
+            file_name = node_data.get("data", {}).get("file")
+            if not file_name:
+                title = node_data.get("data", {}).get("title", f"Node_{node_id}")
+                sanitized_title = "".join(
+                    c if c.isalnum() or c == "_" else "_" for c in title
+                )
+                file_name = f"{node_id}_{sanitized_title}.py"
+
+            file_path = self.projects_root / project_id / file_name
+
+            try:
+                mtime_ns = file_path.stat().st_mtime_ns
+            except OSError:
+                return {
+                    "mode": "unknown",
+                    "inputs": [],
+                    "outputs": [],
+                    "error": f"Node file '{file_name}' not found",
+                }
+
+            # Signature polling from the UI hits the same unchanged file over
+            # and over; reuse the parsed result while the mtime matches
+            cached = self._signature_cache.get(file_path)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+
+            # Read and parse the node code
+            with open(file_path, "r", encoding="utf-8") as f:
+                node_code = f.read()
+
+            result = self._analyze_signature_source(node_code)
+            self._signature_cache[file_path] = (mtime_ns, result)
+            return result
+
+        except Exception as e:
+            return {"mode": "unknown", "inputs": [], "outputs": [], "error": str(e)}
+
+    def _analyze_signature_source(self, node_code: str) -> Dict:
+        """Extract signature metadata from node source code"""
+
+        # Parse the AST to find RunScript function
+        try:
+            tree = ast.parse(node_code)
+        except SyntaxError as e:
+            return {
+                "mode": "unknown",
+                "inputs": [],
+                "outputs": [],
+                "error": f"Syntax error in node code: {e}",
+            }
+
+        # Find RunScript (preferred) or main in a single shallow pass; entry
+        # points are top-level defs, so there is no need for ast.walk to
+        # recurse into every expression of a large script
+        runscript_node = None
+        main_node = None
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                if node.name == "RunScript":
+                    runscript_node = node
+                    break
+                if node.name == "main" and main_node is None:
+                    main_node = node
+
+        # Determine mode and extract metadata
+        if runscript_node:
+            # Python Script Mode - has RunScript function
+            inputs = self._extract_function_inputs(runscript_node, node_code)
+            outputs = self._extract_function_outputs(runscript_node, node_code)
+
+            return {
+                "mode": "script",
+                "inputs": inputs,
+                "outputs": outputs,
+                "function_name": "RunScript",
+            }
+        elif main_node:
+            inputs = self._extract_function_inputs(main_node, node_code)
+            outputs = self._extract_function_outputs(main_node, node_code)
+
+            return {
+                "mode": "basic",
+                "inputs": inputs,
+                "outputs": outputs,
+                "function_name": "main",
+            }
+        else:
+            # No RunScript or main - basic mode
+            return {
+                "mode": "basic",
+                "inputs": [{"name": "input_data", "type": "Any", "default": None}],
+                "outputs": [{"name": "output", "type": "Any"}],
+                "function_name": None,
+            }
+
+    def _extract_function_inputs(
+        self, func_node: ast.FunctionDef, source_code: str
+    ) -> List[Dict]:
+        """Extract input parameters from a function AST node"""
+
+        inputs = []
+        args = func_node.args
+
+        # Get default values (they're aligned to the right)
+        defaults = args.defaults or []
+        num_args = len(args.args)
+        num_defaults = len(defaults)
+
+        for i, arg in enumerate(args.args):
+            param_info = {
+                "name": arg.arg,
+                "type": "Any",  # Default type
+                "default": None,
+                "required": True,
+            }
+
+            # Check if this parameter has a default value
+            default_index = i - (num_args - num_defaults)
+            if default_index >= 0:
+                default_node = defaults[default_index]
+                param_info["required"] = False
+                param_info["default"] = _default_to_value(default_node)
+
+            # Extract type annotation if available
+            if arg.annotation:
+                param_info["type"] = _annotation_to_str(arg.annotation)
+
+            inputs.append(param_info)
+
+        return inputs
+
+    def _extract_function_outputs(
+        self, func_node: ast.FunctionDef, source_code: str
+    ) -> List[Dict]:
+        """Extract output keys from return statements in function"""
+
+        outputs = []
+        seen: Set[str] = set()
+
+        # Find the function's own return statements with an explicit stack;
+        # unlike ast.walk this skips nested defs/lambdas, whose returns don't
+        # belong to this function
+        stack = list(ast.iter_child_nodes(func_node))
+        while stack:
+            node = stack.pop()
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                continue
+            stack.extend(ast.iter_child_nodes(node))
+            if isinstance(node, ast.Return) and node.value:
+                # Check if return value is a dict literal
+                if isinstance(node.value, ast.Dict):
+                    for key in node.value.keys:
+                        if isinstance(key, ast.Constant):
+                            output_name = key.value
+                            if output_name not in seen:
+                                seen.add(output_name)
+                                outputs.append({"name": output_name, "type": "Any"})
+                # Check if return value is a dict() call
+                elif isinstance(node.value, ast.Call):
+                    if (
+                        isinstance(node.value.func, ast.Name)
+                        and node.value.func.id == "dict"
+                    ):
+                        # Extract keys from dict(key=value) syntax
+                        for keyword in node.value.keywords:
+                            if keyword.arg:
+                                if keyword.arg not in seen:
+                                    seen.add(keyword.arg)
+                                    outputs.append({"name": keyword.arg, "type": "Any"})
+
+        # If no outputs found, assume single output
+        if not outputs:
+            outputs = [{"name": "output", "type": "Any"}]
+
+        return outputs
+
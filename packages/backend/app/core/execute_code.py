@@ -1,10 +1,195 @@
-import os
+import atexit
+import json
+import struct
 import subprocess
 import sys
-import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, Optional
-
+from typing import Dict, List, Optional, Tuple
+
+# Reuse the pooled worker script: it reads length-prefixed {"code": ...} frames
+# and answers with the same {output, error, exit_code} shape this module returns.
+WORKER_SCRIPT = str(Path(__file__).resolve().parent / "worker_loop.py")
+POOL_SIZE = 4
+
+_HEADER = struct.Struct(">I")
+
+
+class _WorkerTimeout(Exception):
+    """Raised when a pooled worker was killed for exceeding its timeout."""
+
+
+class _WorkerCrashed(Exception):
+    """Raised when a pooled worker died mid-request (caller falls back)."""
+
+
+class _PooledWorker:
+    """One long-lived worker subprocess speaking the frame protocol."""
+
+    def __init__(
+        self,
+        python_executable: str,
+        working_dir: Optional[str],
+        env: Optional[Dict[str, str]],
+    ) -> None:
+        self.process = subprocess.Popen(
+            [python_executable, "-u", WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=working_dir,
+            env=env,
+        )
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, message: Dict, timeout: int) -> dict:
+        payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        self.process.stdin.write(_HEADER.pack(len(payload)))
+        self.process.stdin.write(payload)
+        self.process.stdin.flush()
+
+        # Pipe reads cannot time out directly, so a timer kills the worker;
+        # the resulting short read is translated into a timeout below.
+        timed_out = threading.Event()
+
+        def _kill_on_timeout() -> None:
+            timed_out.set()
+            self.kill()
+
+        timer = threading.Timer(timeout, _kill_on_timeout)
+        timer.start()
+        try:
+            header = self.process.stdout.read(_HEADER.size)
+            if len(header) < _HEADER.size:
+                raise _WorkerTimeout if timed_out.is_set() else _WorkerCrashed
+            (length,) = _HEADER.unpack(header)
+            body = self.process.stdout.read(length)
+            if len(body) < length:
+                raise _WorkerTimeout if timed_out.is_set() else _WorkerCrashed
+            return json.loads(body.decode("utf-8"))
+        finally:
+            timer.cancel()
+
+    def kill(self) -> None:
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+
+
+class _SyncWorkerPool:
+    """Fixed set of reusable worker slots for one (executable, cwd, env) config."""
+
+    def __init__(
+        self,
+        python_executable: str,
+        working_dir: Optional[str],
+        env: Optional[Dict[str, str]],
+        size: int = POOL_SIZE,
+    ) -> None:
+        self.python_executable = python_executable
+        self.working_dir = working_dir
+        self.env = dict(env) if env is not None else None
+        self._slots: List[Optional[_PooledWorker]] = [None] * size
+        self._locks = [threading.Lock() for _ in range(size)]
+
+    def run(self, code: str, timeout: int) -> Optional[dict]:
+        """Run code on an idle worker, or return None so the caller falls back.
+
+        None is only returned when the code never started (every slot busy);
+        once a request has been handed to a worker the outcome — including a
+        mid-request worker death — is reported as a result, never retried.
+        """
+        for index, lock in enumerate(self._locks):
+            if not lock.acquire(blocking=False):
+                continue
+            try:
+                worker = self._slots[index]
+                if worker is None or not worker.alive:
+                    worker = _PooledWorker(
+                        self.python_executable, self.working_dir, self.env
+                    )
+                    self._slots[index] = worker
+                try:
+                    return worker.request({"code": code}, timeout)
+                except _WorkerTimeout:
+                    self._slots[index] = None
+                    return {
+                        "output": "",
+                        "error": "Code execution timed out",
+                        "exit_code": -1,
+                    }
+                except (_WorkerCrashed, OSError, ValueError):
+                    # The code may have run (and performed side effects) before
+                    # the worker died, so falling back to a fresh subprocess
+                    # would risk executing it twice. Report the failure instead.
+                    worker.kill()
+                    self._slots[index] = None
+                    return {
+                        "output": "",
+                        "error": "Worker process died during execution",
+                        "exit_code": -1,
+                    }
+            finally:
+                lock.release()
+        # Every slot busy: let the caller run the one-shot path instead of
+        # queueing behind long executions.
+        return None
+
+    def shutdown(self) -> None:
+        for worker in self._slots:
+            if worker is not None:
+                worker.kill()
+        self._slots = [None] * len(self._slots)
+
+
+_WORKER_POOL: Dict[Tuple, _SyncWorkerPool] = {}
+_pool_lock = threading.Lock()
+
+
+def _get_pool(
+    python_executable: str,
+    working_dir: Optional[str],
+    env: Optional[Dict[str, str]],
+) -> _SyncWorkerPool:
+    key = (
+        python_executable,
+        working_dir,
+        tuple(sorted(env.items())) if env is not None else None,
+    )
+    with _pool_lock:
+        pool = _WORKER_POOL.get(key)
+        if pool is None:
+            pool = _SyncWorkerPool(python_executable, working_dir, env)
+            _WORKER_POOL[key] = pool
+        return pool
+
+
+def discard_pools(working_dir: str) -> None:
+    """Kill and drop pooled workers bound to a project path.
+
+    Called alongside venv create/delete so stale workers never serve code
+    against a removed interpreter.
+    """
+    with _pool_lock:
+        for key in [key for key in _WORKER_POOL if key[1] == working_dir]:
+            _WORKER_POOL.pop(key).shutdown()
+
+
+def _shutdown_pools() -> None:
+    with _pool_lock:
+        for pool in _WORKER_POOL.values():
+            pool.shutdown()
+        _WORKER_POOL.clear()
+
+
+atexit.register(_shutdown_pools)
+
+
 def execute_python_code(
     code: str,
     timeout: int = 30,
@@ -12,56 +197,81 @@ def execute_python_code(
     working_dir: Optional[str] = None,
     env: Optional[Dict[str, str]] = None,
 ) -> dict:
-    """
-    Execute Python code in a secure temporary environment
-    
-    Args:
-        code: Python code to execute
-        timeout: Maximum execution time in seconds
-        python_executable: Optional path to Python executable (for venv)
-        working_dir: Optional working directory for execution
-        
-    Returns:
-        Dictionary with output, error, and exit_code
-    """
-    try:
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-            temp_file.write(code)
-            temp_file_path = temp_file.name
-        
-        try:
-            # Use provided Python executable or system default
-            python_exe = Path(python_executable) if python_executable else Path(sys.executable)
-
-            result = subprocess.run(
-                [str(python_exe), temp_file_path],
-                capture_output=True,
-                text=True,
-                timeout=timeout,
-                cwd=working_dir,
-                env=env,
-            )
-            
-            return {
-                "output": result.stdout,
-                "error": result.stderr if result.stderr else None,
-                "exit_code": result.returncode
-            }
-        finally:
-            os.unlink(temp_file_path)
-            
-    except subprocess.TimeoutExpired:
-        return {
-            "output": "",
-            "error": "Code execution timed out",
-            "exit_code": -1
-        }
+    """
+    Execute Python code in a secure temporary environment
+
+    Repeated calls with the same executable/working dir/env reuse a pool of
+    warm worker processes, skipping interpreter startup; calls the pool
+    cannot start (spawn failure, all slots busy) fall back to a one-shot
+    subprocess. Execution is never retried once a worker has the code.
+
+    Args:
+        code: Python code to execute
+        timeout: Maximum execution time in seconds
+        python_executable: Optional path to Python executable (for venv)
+        working_dir: Optional working directory for execution
+
+    Returns:
+        Dictionary with output, error, and exit_code
+    """
+    python_exe = str(Path(python_executable)) if python_executable else sys.executable
+
+    try:
+        pool = _get_pool(python_exe, working_dir, env)
+        result = pool.run(code, timeout)
+        if result is not None:
+            return result
     except FileNotFoundError:
         return {
             "output": "",
             "error": f"Python 실행 파일을 찾을 수 없습니다: {python_executable}",
             "exit_code": -1,
         }
+    except Exception:
+        pass
+
+    return _execute_via_subprocess(code, timeout, python_exe, working_dir, env)
+
+
+def _execute_via_subprocess(
+    code: str,
+    timeout: int,
+    python_exe: str,
+    working_dir: Optional[str],
+    env: Optional[Dict[str, str]],
+) -> dict:
+    """One-shot subprocess path used when the worker pool cannot serve a call."""
+    try:
+        # Feed the program over stdin rather than a temp file: no write/unlink
+        # syscalls and the code never touches disk
+        result = subprocess.run(
+            [python_exe, "-"],
+            input=code,
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            cwd=working_dir,
+            env=env,
+        )
+
+        return {
+            "output": result.stdout,
+            "error": result.stderr if result.stderr else None,
+            "exit_code": result.returncode
+        }
+
+    except subprocess.TimeoutExpired:
+        return {
+            "output": "",
+            "error": "Code execution timed out",
+            "exit_code": -1
+        }
+    except FileNotFoundError:
+        return {
+            "output": "",
+            "error": f"Python 실행 파일을 찾을 수 없습니다: {python_exe}",
+            "exit_code": -1,
+        }
     except Exception as e:
         return {
             "output": "",
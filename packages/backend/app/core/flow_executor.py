@@ -6,27 +6,28 @@ Executes node-based Python code flows in isolated environments
 import asyncio
 import json
 import os
+import sys
 import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import defaultdict, deque
-
-from .execute_code import execute_python_code
-from . import venv_manager
+from collections import defaultdict, deque
+
+from .execute_code import execute_python_code
+from . import venv_manager
 
 
 class FlowExecutor:
     """Execute node-based Python flows with isolation and safety"""
 
-    def __init__(self, projects_root: str):
-        self.projects_root = Path(projects_root)
-
-    def _execution_context(self, project_id: str) -> Tuple[str, Dict[str, str], Path]:
-        """Return python executable, environment, and project path for execution."""
-        project_path = self.projects_root / project_id
-        python_path = venv_manager.python_bin(project_path)
-        env = venv_manager.execution_env(project_path)
-        return str(python_path), env, project_path
+    def __init__(self, projects_root: str):
+        self.projects_root = Path(projects_root)
+
+    def _execution_context(self, project_id: str) -> Tuple[str, Dict[str, str], Path]:
+        """Return python executable, environment, and project path for execution."""
+        project_path = self.projects_root / project_id
+        python_path = venv_manager.python_bin(project_path)
+        env = venv_manager.execution_env(project_path)
+        return str(python_path), env, project_path
 
     def _load_structure(self, project_id: str) -> Tuple[Dict[str, Dict], List[Dict]]:
         """Load project structure from JSON file"""
@@ -37,9 +38,14 @@ class FlowExecutor:
         with open(structure_file, "r", encoding="utf-8") as f:
             data = json.load(f)
 
-        # Convert nodes list to dict for easier access
-        nodes = {node["id"]: node for node in data.get("nodes", [])}
+        # Convert nodes list to dict for easier access. Node IDs are compared
+        # constantly during scheduling (dependency sets, output maps), so
+        # intern them once here to make those lookups pointer comparisons.
+        nodes = {sys.intern(node["id"]): node for node in data.get("nodes", [])}
         edges = data.get("edges", [])
+        for edge in edges:
+            edge["source"] = sys.intern(edge["source"])
+            edge["target"] = sys.intern(edge["target"])
 
         return nodes, edges
 
@@ -160,16 +166,16 @@ class FlowExecutor:
             )
             file_name = f"{node_id}_{sanitized_title}.py"
 
-        project_path = self.projects_root / project_id
-        file_path = project_path / file_name
-
-        if not file_path.exists():
+        project_path = self.projects_root / project_id
+        file_path = project_path / file_name
+
+        if not file_path.exists():
             # Log more details for debugging
             import os
 
-            existing_files = (
-                list(project_path.glob("*.py")) if project_path.exists() else []
-            )
+            existing_files = (
+                list(project_path.glob("*.py")) if project_path.exists() else []
+            )
             file_list = (
                 "\n".join([f.name for f in existing_files])
                 if existing_files
@@ -179,8 +185,8 @@ class FlowExecutor:
             return {
                 "status": "error",
                 "error": f"Node file '{file_name}' not found in project '{project_id}'",
-                "logs": f"Looking for: {file_path}\n\nAvailable files in project:\n{file_list}",
-            }
+                "logs": f"Looking for: {file_path}\n\nAvailable files in project:\n{file_list}",
+            }
 
         # Read node code
         with open(file_path, "r", encoding="utf-8") as f:
@@ -225,7 +231,7 @@ try:
     else:
         # Find first callable function
         for name, obj in list(locals().items()):
-            if callable(obj) and not name.startswith('_') and name not in ['json', 'sys', 'traceback', 'inspect']:
+            if callable(obj) and not name.startswith('_') and name not in {'json', 'sys', 'traceback', 'inspect'}:
                 import inspect
                 try:
                     sig = inspect.signature(obj)
@@ -267,25 +273,25 @@ except Exception as e:
     }}))
 """
 
-        # Execute with project-specific virtual environment
-        start_time = time.time()
-        try:
-            python_exe, exec_env, project_path = self._execution_context(project_id)
-        except venv_manager.VenvError as exc:
-            return {
-                "status": "error",
-                "error": str(exc),
-                "execution_time_ms": 0,
-                "logs": "가상환경을 초기화할 수 없습니다.",
-            }
-
-        execution_result = execute_python_code(
-            wrapper_code,
-            timeout,
-            python_executable=python_exe,
-            working_dir=str(project_path),
-            env=exec_env,
-        )
+        # Execute with project-specific virtual environment
+        start_time = time.time()
+        try:
+            python_exe, exec_env, project_path = self._execution_context(project_id)
+        except venv_manager.VenvError as exc:
+            return {
+                "status": "error",
+                "error": str(exc),
+                "execution_time_ms": 0,
+                "logs": "가상환경을 초기화할 수 없습니다.",
+            }
+
+        execution_result = execute_python_code(
+            wrapper_code,
+            timeout,
+            python_executable=python_exe,
+            working_dir=str(project_path),
+            env=exec_env,
+        )
         execution_time_ms = round((time.time() - start_time) * 1000)
 
         # Parse result
@@ -1,6 +1,10 @@
 from pathlib import Path
 from typing import Dict, Any, Optional
 
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
 def create_node(project_id: str, node_id: str, node_type: str, position: Dict[str, float], 
                 data: Dict[str, Any]) -> Dict[str, Any]:
     """Create a new node and corresponding python file matching React Flow structure"""
@@ -214,12 +218,14 @@ def save_node_code(project_id: str, node_id: str, code: str) -> Dict[str, Any]:
                     # Use word boundaries to avoid partial replacements
                     pattern = r'\b' + re.escape(old_param) + r'\b'
                     modified_code = re.sub(pattern, new_param, modified_code)
-                    print(f"Renamed variable: {old_param} -> {new_param}")
+                    logger.debug("Renamed variable: %s -> %s", old_param, new_param)
             code = modified_code
     
     except (SyntaxError, Exception) as e:
         # If parsing fails, just save the code as-is
-        print(f"Warning: Could not parse code for automatic variable renaming: {e}")
+        logger.warning(
+            "Could not parse code for automatic variable renaming: %s", e
+        )
     
     # Write the updated code
     with open(py_filepath, 'w') as f:
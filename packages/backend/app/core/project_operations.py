@@ -10,6 +10,9 @@ from .projects_registry import (
     get_projects_registry,
 )
 from . import venv_manager
+from .logging import get_logger
+
+logger = get_logger(__name__)
 
 # Get absolute path to projects directory
 PROJECTS_BASE_PATH = (
@@ -85,7 +88,7 @@ def _initialize_default_projects_if_needed(registry: Dict[str, Any]) -> Dict[str
             else:
                 shutil.copy2(item, destination)
     except OSError as error:
-        print(f"Failed to initialize example project assets: {error}")
+        logger.error("Failed to initialize example project assets: %s", error)
 
     updated_registry = get_projects_registry()
     if not any(
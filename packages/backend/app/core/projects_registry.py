@@ -3,6 +3,10 @@ import os
 from pathlib import Path
 from typing import List, Dict, Any
 
+from .logging import get_logger
+
+logger = get_logger(__name__)
+
 # Get absolute path to projects directory
 PROJECTS_BASE_PATH = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "projects"
 PROJECTS_REGISTRY_FILE = PROJECTS_BASE_PATH / "projects.json"
@@ -38,7 +42,7 @@ def get_projects_registry() -> Dict[str, Any]:
                 return {"projects": []}
             return {"projects": projects}
     except (json.JSONDecodeError, IOError) as e:
-        print(f"Error reading projects registry: {e}")
+        logger.error("Error reading projects registry: %s", e)
         # Return empty registry if file is corrupted
         return {"projects": []}
 
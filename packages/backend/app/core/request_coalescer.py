@@ -0,0 +1,80 @@
+"""Micro-batching for concurrent requests that share a dispatch key.
+
+Requests arriving for the same key within a short window are collected and
+handed to a single runner call as one batch, amortizing per-dispatch overhead
+(worker round-trip, JSON framing). Each caller still awaits only its own
+result.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, List
+
+DEFAULT_WINDOW_SECONDS = 0.005
+DEFAULT_MAX_BATCH = 16
+
+BatchRunner = Callable[[List[Any]], Awaitable[List[Any]]]
+
+
+class _Batch:
+    __slots__ = ("items", "futures", "closed")
+
+    def __init__(self) -> None:
+        self.items: List[Any] = []
+        self.futures: List[asyncio.Future] = []
+        self.closed = False
+
+
+class Coalescer:
+    """Collects concurrent submissions per key into single runner calls."""
+
+    def __init__(
+        self,
+        window: float = DEFAULT_WINDOW_SECONDS,
+        max_batch: int = DEFAULT_MAX_BATCH,
+    ) -> None:
+        self._window = window
+        self._max_batch = max_batch
+        self._batches: Dict[Hashable, _Batch] = {}
+
+    async def submit(self, key: Hashable, item: Any, runner: BatchRunner) -> Any:
+        """Queue one item under ``key`` and await its individual result.
+
+        ``runner`` receives the whole batch's items in arrival order and must
+        return one result per item. The runner of the request that opened the
+        batch is the one invoked.
+        """
+        loop = asyncio.get_running_loop()
+
+        batch = self._batches.get(key)
+        if batch is None or batch.closed or len(batch.items) >= self._max_batch:
+            batch = _Batch()
+            self._batches[key] = batch
+            asyncio.ensure_future(self._flush(key, batch, runner))
+
+        future: asyncio.Future = loop.create_future()
+        batch.items.append(item)
+        batch.futures.append(future)
+        return await future
+
+    async def _flush(self, key: Hashable, batch: _Batch, runner: BatchRunner) -> None:
+        await asyncio.sleep(self._window)
+        batch.closed = True
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+
+        try:
+            results = await runner(list(batch.items))
+            if len(results) != len(batch.futures):
+                raise RuntimeError(
+                    f"batch runner returned {len(results)} results for {len(batch.futures)} items"
+                )
+        except Exception as exc:
+            for future in batch.futures:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, result in zip(batch.futures, results):
+            if not future.done():
+                future.set_result(result)
@@ -14,6 +14,11 @@ from uuid import uuid4
 
 from .logging import get_logger
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
 __all__ = [
     "UserComponent",
     "UserComponentStore",
@@ -28,6 +33,33 @@ logger = get_logger(__name__)
 USER_TEMPLATES_ENV = "AIM_USER_TEMPLATES_DIR"
 DEFAULT_USER_TEMPLATES_DIR = Path(__file__).resolve().parents[2] / "user_templates"
 
+# Precompiled patterns for name normalization and id slugs; save() runs all
+# three, and module-level compilation skips re's internal cache lookup per call
+_NORMALIZE_WS = re.compile(r"\s+")
+_SLUG_NON_ALNUM = re.compile(r"[^a-z0-9-]")
+_SLUG_COLLAPSE_DASH = re.compile(r"-+")
+
+# Cached listings per base directory as
+# (dir_mtime_ns, {component_id: (metadata_mtime_ns, component)}, {normalized_name: component_id}).
+# An unchanged directory mtime serves list() from cache with a single stat;
+# when it changes, only metadata files whose own mtime moved are re-parsed.
+# save()/delete() patch the cache in place so the next list() skips I/O.
+_LIST_CACHE: Dict[Path, tuple] = {}
+
+
+def _metadata_dumps(payload: Dict[str, Any]) -> bytes:
+    """Serialize component metadata (orjson when available)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(payload, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def _metadata_loads(blob: bytes) -> Dict[str, Any]:
+    """Parse component metadata bytes (orjson when available)."""
+    if orjson is not None:
+        return orjson.loads(blob)
+    return json.loads(blob)
+
 
 @dataclass
 class UserComponent:
@@ -96,8 +128,20 @@ class UserComponentStore:
         self.base_dir.mkdir(parents=True, exist_ok=True)
 
     @property
-    def metadata_files(self) -> Iterable[Path]:
-        return self.base_dir.glob("*/metadata.json")
+    def metadata_files(self) -> Iterable[str]:
+        """Candidate metadata.json paths, one per component directory.
+
+        os.scandir reports entry types without a stat per entry (unlike
+        Path.glob); whether metadata.json actually exists is settled by the
+        caller's own stat, so discovery costs one syscall per directory.
+        """
+        try:
+            with os.scandir(self.base_dir) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield os.path.join(entry.path, "metadata.json")
+        except OSError:
+            return
 
     def save(
         self,
@@ -131,30 +175,80 @@ class UserComponentStore:
         metadata_path = component_dir / "metadata.json"
         code_path = component_dir / "node.py"
 
-        metadata_path.write_text(json.dumps(metadata_payload, indent=2, ensure_ascii=False), encoding="utf-8")
+        metadata_path.write_bytes(_metadata_dumps(metadata_payload))
         code_path.write_text(code, encoding="utf-8")
 
         logger.info("Stored user component", extra={"component_id": component_id, "component_name": name})
 
-        return UserComponent.from_metadata(metadata_payload, self.base_dir)
+        component = UserComponent.from_metadata(metadata_payload, self.base_dir)
+        self._cache_component(component, metadata_path)
+        return component
 
     def list(self) -> List[UserComponent]:
-        components: List[UserComponent] = []
+        components = [entry[1] for entry in self._cache_entries().values()]
+        components.sort(key=lambda c: c.created_at, reverse=True)
+        return components
+
+    def _cache_entries(self) -> Dict[str, tuple]:
+        """Return {component_id: (metadata_mtime_ns, component)}, refreshed incrementally."""
+        try:
+            dir_mtime = self.base_dir.stat().st_mtime_ns
+        except OSError:
+            dir_mtime = -1
+
+        cached = _LIST_CACHE.get(self.base_dir)
+        if cached is not None and cached[0] == dir_mtime:
+            return cached[1]
+
+        previous = cached[1] if cached is not None else {}
+        entries: Dict[str, tuple] = {}
         for metadata_path in self.metadata_files:
+            component_id = os.path.basename(os.path.dirname(metadata_path))
             try:
-                metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+                file_mtime = os.stat(metadata_path).st_mtime_ns
+            except OSError:
+                # Directory without metadata.json
+                continue
+            prior = previous.get(component_id)
+            if prior is not None and prior[0] == file_mtime:
+                entries[component_id] = prior
+                continue
+            try:
+                with open(metadata_path, "rb") as handle:
+                    metadata = _metadata_loads(handle.read())
                 component = UserComponent.from_metadata(metadata, self.base_dir)
-                components.append(component)
             except Exception as exc:  # pragma: no cover - log and continue for robustness
-                logger.warning("Failed to load user component metadata", extra={"path": str(metadata_path)}, exc_info=exc)
-        components.sort(key=lambda c: c.created_at, reverse=True)
-        return components
+                logger.warning("Failed to load user component metadata", extra={"path": metadata_path}, exc_info=exc)
+                continue
+            entries[component_id] = (file_mtime, component)
+
+        names = {
+            self._normalize_name(entry[1].name): component_id
+            for component_id, entry in entries.items()
+        }
+        _LIST_CACHE[self.base_dir] = (dir_mtime, entries, names)
+        return entries
+
+    def _cache_component(self, component: UserComponent, metadata_path: Path) -> None:
+        """Patch the cached listing after a save so the next list() skips I/O."""
+        cached = _LIST_CACHE.get(self.base_dir)
+        if cached is None:
+            return
+        try:
+            dir_mtime = self.base_dir.stat().st_mtime_ns
+            file_mtime = metadata_path.stat().st_mtime_ns
+        except OSError:
+            _LIST_CACHE.pop(self.base_dir, None)
+            return
+        cached[1][component.id] = (file_mtime, component)
+        cached[2][self._normalize_name(component.name)] = component.id
+        _LIST_CACHE[self.base_dir] = (dir_mtime, cached[1], cached[2])
 
     def get(self, component_id: str) -> UserComponent:
         metadata_path = self.base_dir / component_id / "metadata.json"
         if not metadata_path.exists():
             raise FileNotFoundError(f"Component '{component_id}' not found")
-        metadata = json.loads(metadata_path.read_text(encoding="utf-8"))
+        metadata = _metadata_loads(metadata_path.read_bytes())
         return UserComponent.from_metadata(metadata, self.base_dir)
 
     def delete(self, component_id: str) -> None:
@@ -163,19 +257,33 @@ class UserComponentStore:
             raise FileNotFoundError(f"Component '{component_id}' not found")
         shutil.rmtree(component_dir)
 
+        cached = _LIST_CACHE.get(self.base_dir)
+        if cached is not None:
+            entry = cached[1].pop(component_id, None)
+            if entry is not None:
+                cached[2].pop(self._normalize_name(entry[1].name), None)
+            try:
+                dir_mtime = self.base_dir.stat().st_mtime_ns
+            except OSError:
+                dir_mtime = -1
+            _LIST_CACHE[self.base_dir] = (dir_mtime, cached[1], cached[2])
+
     def _ensure_unique_name(self, normalized_name: str) -> None:
-        for existing in self.list():
-            if self._normalize_name(existing.name) == normalized_name:
-                raise ValueError(f"Component name '{existing.name}' already exists")
+        entries = self._cache_entries()
+        existing_id = _LIST_CACHE[self.base_dir][2].get(normalized_name)
+        if existing_id is not None:
+            raise ValueError(
+                f"Component name '{entries[existing_id][1].name}' already exists"
+            )
 
     @staticmethod
     def _normalize_name(name: str) -> str:
-        return re.sub(r"\s+", " ", name.strip()).lower()
+        return _NORMALIZE_WS.sub(" ", name.strip()).lower()
 
     @staticmethod
     def _generate_id(normalized_name: str) -> str:
-        slug = re.sub(r"[^a-z0-9-]", "-", normalized_name.replace(" ", "-"))
-        slug = re.sub(r"-+", "-", slug).strip("-") or "component"
+        slug = _SLUG_NON_ALNUM.sub("-", normalized_name.replace(" ", "-"))
+        slug = _SLUG_COLLAPSE_DASH.sub("-", slug).strip("-") or "component"
         suffix = uuid4().hex[:8]
         timestamp = datetime.now(timezone.utc).strftime("%Y%m%d%H%M%S")
         return f"{slug}-{timestamp}-{suffix}"
@@ -1,6 +1,7 @@
 """Utilities for managing per-project Python virtual environments."""
 from __future__ import annotations
 
+import functools
 import os
 import shutil
 import subprocess
@@ -253,6 +254,46 @@ def execution_env(project_path: Path | str, extra_env: Optional[Dict[str, str]]
     return env
 
 
+@functools.lru_cache(maxsize=256)
+def _resolved_python_bin(project_path_str: str) -> str:
+    return str(python_bin(project_path_str))
+
+
+@functools.lru_cache(maxsize=256)
+def _resolved_env_items(project_path_str: str) -> tuple:
+    return tuple(execution_env(project_path_str).items())
+
+
+def cached_python_bin(project_path: Path | str) -> str:
+    """Memoized ``python_bin`` for hot request paths.
+
+    The result is a pure function of the project path for the lifetime of a
+    venv; call :func:`clear_resolution_cache` after creating or deleting one.
+    """
+    return _resolved_python_bin(str(project_path))
+
+
+def cached_execution_env(project_path: Path | str) -> Dict[str, str]:
+    """Memoized ``execution_env`` snapshot for hot request paths."""
+    return dict(_resolved_env_items(str(project_path)))
+
+
+def clear_resolution_cache(project_path: Path | str | None = None) -> None:
+    """Invalidate cached venv resolution after a venv changes.
+
+    Also tears down pooled worker processes for the project: a warm worker
+    keeps already-imported modules in ``sys.modules``, so it would otherwise
+    keep serving the old interpreter, environment, or package versions.
+    """
+    _resolved_python_bin.cache_clear()
+    _resolved_env_items.cache_clear()
+    if project_path is not None:
+        from . import execute_code, worker_pool
+
+        worker_pool.discard_pools(str(project_path))
+        execute_code.discard_pools(str(project_path))
+
+
 def create(project_path: Path | str, base_requirements: Sequence[str] | None = None) -> Path:
     """Create a virtual environment for the given project.
 
@@ -270,6 +311,8 @@ def create(project_path: Path | str, base_requirements: Sequence[str] | None = N
     if venv_path.exists():
         return venv_path
 
+    clear_resolution_cache(project_path)
+
     command = [
         "uv",
         "venv",
@@ -318,12 +361,14 @@ def install(project_path: Path | str, packages: Sequence[str]) -> subprocess.Com
         *packages,
     ]
     try:
-        return _run_uv(command, "패키지 설치에 실패했습니다")
+        result = _run_uv(command, "패키지 설치에 실패했습니다")
     except VenvError as exc:
         if "Operation not permitted" not in str(exc):
             raise
         fallback_cmd = ["install", *packages]
-        return _run_python_pip(project_path, fallback_cmd, "패키지 설치에 실패했습니다")
+        result = _run_python_pip(project_path, fallback_cmd, "패키지 설치에 실패했습니다")
+    clear_resolution_cache(project_path)
+    return result
 
 
 def uninstall(project_path: Path | str, packages: Sequence[str]) -> subprocess.CompletedProcess[str]:
@@ -333,7 +378,9 @@ def uninstall(project_path: Path | str, packages: Sequence[str]) -> subprocess.C
 
     project_path = _project_path(Path(project_path))
     command = ["uninstall", "-y", *packages]
-    return _run_python_pip(project_path, command, "패키지 삭제에 실패했습니다")
+    result = _run_python_pip(project_path, command, "패키지 삭제에 실패했습니다")
+    clear_resolution_cache(project_path)
+    return result
 
 
 def list_installed(project_path: Path | str) -> List[Dict[str, str]]:
@@ -369,6 +416,7 @@ def delete(project_path: Path | str) -> None:
     venv_path = _venv_path(project_path)
     if venv_path.exists():
         shutil.rmtree(venv_path)
+    clear_resolution_cache(project_path)
 
 
 @contextmanager
@@ -480,6 +528,9 @@ def activated(project_path: Path | str):
 
 __all__ = [
     "VenvError",
+    "cached_execution_env",
+    "cached_python_bin",
+    "clear_resolution_cache",
     "create",
     "delete",
     "execution_env",
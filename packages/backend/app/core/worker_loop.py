@@ -0,0 +1,217 @@
+"""Long-lived execution worker for pooled node execution.
+
+This script is launched with a project's virtual-environment Python and kept
+alive between requests so repeated executions skip interpreter startup.
+It speaks a tiny length-prefixed JSON protocol over stdin/stdout:
+
+    request:  {"code": "<python source>", "input": <optional JSON value>}
+    response: {"output": "<captured stdout>", "error": "<stderr or None>", "exit_code": 0|1}
+
+The optional ``input`` value is exposed to the executed code as the global
+``_WORKER_INPUT``, so callers can pass payloads without interpolating them
+into the source (which would force a re-parse scaling with payload size).
+
+Requests with ``"mode": "node"`` additionally carry ``entrypoint``,
+``filename`` and a list of inputs; the worker execs the node code (compiled
+once per distinct source via a small cache), calls the entrypoint per input,
+and returns per-input ``results`` in the response frame. The framing logic
+lives here as plain Python, so no wrapper source is parsed per request.
+
+Node requests with ``"stream": true`` run a single input and emit one
+``{"chunk": ...}`` frame per item when the entrypoint returns a generator
+(one frame total otherwise), terminated by a ``{"done": true, ...}`` frame.
+
+The worker execs each request's code in a fresh namespace, so state does not
+leak between executions. Only the interpreter and imported stdlib stay warm.
+"""
+
+import io
+import json
+import struct
+import sys
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+
+_HEADER = struct.Struct(">I")
+
+
+def _read_frame(stream):
+    header = stream.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return None
+    (length,) = _HEADER.unpack(header)
+    payload = stream.read(length)
+    if len(payload) < length:
+        return None
+    return json.loads(payload.decode("utf-8"))
+
+
+def _write_frame(stream, message):
+    payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+    stream.write(_HEADER.pack(len(payload)))
+    stream.write(payload)
+    stream.flush()
+
+
+# Compiled user code keyed by source string; node code rarely changes between
+# consecutive runs, so repeat executions skip the CPython parser entirely.
+_CODE_CACHE = {}
+_CODE_CACHE_MAX = 128
+
+
+def _compiled(code, filename):
+    code_object = _CODE_CACHE.get(code)
+    if code_object is None:
+        code_object = compile(code, filename, "exec")
+        if len(_CODE_CACHE) >= _CODE_CACHE_MAX:
+            _CODE_CACHE.clear()
+        _CODE_CACHE[code] = code_object
+    return code_object
+
+
+def _default_entrypoint(namespace):
+    main = namespace.get("main")
+    if callable(main):
+        return main
+    for name, obj in list(namespace.items()):
+        if callable(obj) and not name.startswith("_") and name not in ("json", "sys"):
+            return obj
+    return None
+
+
+def _execute_node(request):
+    code = request.get("code", "")
+    inputs = request.get("input") or [None]
+    filename = request.get("filename") or "<node>"
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    namespace = {"__name__": "__main__"}
+    results = []
+
+    try:
+        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+            exec(_compiled(code, filename), namespace)
+
+            entrypoint = namespace.get(request.get("entrypoint") or "")
+            if not callable(entrypoint):
+                entrypoint = _default_entrypoint(namespace)
+
+            for input_data in inputs:
+                try:
+                    if entrypoint is None:
+                        raise RuntimeError("No callable entrypoint found in node code")
+                    output = entrypoint(input_data) if input_data is not None else entrypoint()
+                    json.dumps(output)  # fail per-item if not JSON-serializable
+                    results.append({"success": True, "output": output})
+                except Exception as exc:
+                    results.append({
+                        "success": False,
+                        "error": str(exc),
+                        "traceback": traceback.format_exc(),
+                    })
+        exit_code = 0
+    except BaseException:
+        stderr_buffer.write(traceback.format_exc())
+        exit_code = 1
+
+    stderr_text = stderr_buffer.getvalue()
+    return {
+        "output": stdout_buffer.getvalue(),
+        "error": stderr_text if stderr_text else None,
+        "exit_code": exit_code,
+        "results": results,
+    }
+
+
+def _iter_node_stream(request):
+    """Yield chunk frames for one streamed node execution, then a done frame.
+
+    Frames are written to the real stdout captured in main(); user prints stay
+    redirected for the generator's whole lifetime so they can't corrupt the
+    frame protocol.
+    """
+    code = request.get("code", "")
+    inputs = request.get("input") or [None]
+    input_data = inputs[0] if isinstance(inputs, list) else inputs
+    filename = request.get("filename") or "<node>"
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    namespace = {"__name__": "__main__"}
+    exit_code = 0
+
+    try:
+        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+            exec(_compiled(code, filename), namespace)
+
+            entrypoint = namespace.get(request.get("entrypoint") or "")
+            if not callable(entrypoint):
+                entrypoint = _default_entrypoint(namespace)
+            if entrypoint is None:
+                raise RuntimeError("No callable entrypoint found in node code")
+
+            result = entrypoint(input_data) if input_data is not None else entrypoint()
+
+            if hasattr(result, "__next__"):
+                for item in result:
+                    json.dumps(item)  # fail fast if not JSON-serializable
+                    yield {"chunk": item}
+            else:
+                json.dumps(result)
+                yield {"chunk": result}
+    except BaseException:
+        stderr_buffer.write(traceback.format_exc())
+        exit_code = 1
+
+    stderr_text = stderr_buffer.getvalue()
+    yield {
+        "done": True,
+        "output": stdout_buffer.getvalue(),
+        "error": stderr_text if stderr_text else None,
+        "exit_code": exit_code,
+    }
+
+
+def _execute(request):
+    code = request.get("code", "")
+    stdout_buffer = io.StringIO()
+    stderr_buffer = io.StringIO()
+    namespace = {"__name__": "__main__"}
+    if "input" in request:
+        namespace["_WORKER_INPUT"] = request["input"]
+
+    try:
+        with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+            exec(code, namespace)
+        exit_code = 0
+    except BaseException:
+        stderr_buffer.write(traceback.format_exc())
+        exit_code = 1
+
+    stderr_text = stderr_buffer.getvalue()
+    return {
+        "output": stdout_buffer.getvalue(),
+        "error": stderr_text if stderr_text else None,
+        "exit_code": exit_code,
+    }
+
+
+def main() -> None:
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+
+    while True:
+        request = _read_frame(stdin)
+        if request is None:
+            break
+        if request.get("mode") == "node":
+            if request.get("stream"):
+                for frame in _iter_node_stream(request):
+                    _write_frame(stdout, frame)
+            else:
+                _write_frame(stdout, _execute_node(request))
+        else:
+            _write_frame(stdout, _execute(request))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,340 @@
+"""Persistent pool of pre-warmed Python worker processes.
+
+Spawning a fresh interpreter for every execute-node request costs hundreds of
+milliseconds of fork/exec and interpreter startup. This module keeps a small
+pool of long-lived worker processes per (python executable, project path, env) and
+dispatches code to them over a length-prefixed JSON pipe protocol implemented
+by ``worker_loop.py``.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+WORKER_SCRIPT = str(Path(__file__).resolve().parent / "worker_loop.py")
+DEFAULT_POOL_SIZE = 4
+
+_HEADER = struct.Struct(">I")
+
+_pools: Dict[Tuple, "WorkerPool"] = {}
+
+
+def _env_key(env: Optional[Dict[str, str]]) -> Optional[Tuple]:
+    """Hashable signature of an execution env for pool keying."""
+    return tuple(sorted(env.items())) if env is not None else None
+
+
+class _Worker:
+    """A single long-lived worker subprocess."""
+
+    def __init__(self, process: asyncio.subprocess.Process) -> None:
+        self.process = process
+
+    @property
+    def alive(self) -> bool:
+        return self.process.returncode is None
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        payload = json.dumps(message, ensure_ascii=False).encode("utf-8")
+        self.process.stdin.write(_HEADER.pack(len(payload)))
+        self.process.stdin.write(payload)
+        await self.process.stdin.drain()
+
+    async def read(self) -> Dict[str, Any]:
+        header = await self.process.stdout.readexactly(_HEADER.size)
+        (length,) = _HEADER.unpack(header)
+        body = await self.process.stdout.readexactly(length)
+        return json.loads(body.decode("utf-8"))
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        await self.send(message)
+        return await self.read()
+
+    async def kill(self) -> None:
+        if self.alive:
+            try:
+                self.process.kill()
+            except ProcessLookupError:
+                pass
+        try:
+            await self.process.wait()
+        except Exception:
+            pass
+
+
+class WorkerPool:
+    """Pool of warm workers for one (python executable, project path, env) config."""
+
+    def __init__(
+        self,
+        python_executable: str,
+        working_dir: str,
+        env: Optional[Dict[str, str]] = None,
+        pool_size: int = DEFAULT_POOL_SIZE,
+    ) -> None:
+        self.python_executable = python_executable
+        self.working_dir = working_dir
+        self.env = dict(env) if env is not None else None
+        self.pool_size = pool_size
+        self._idle: asyncio.Queue[_Worker] = asyncio.Queue()
+        self._spawned = 0
+        self._spawn_lock = asyncio.Lock()
+        # Every live worker, including ones checked out by a request, so a
+        # synchronous teardown can reach them all
+        self._workers: set = set()
+
+    async def _spawn_worker(self) -> _Worker:
+        process = await asyncio.create_subprocess_exec(
+            self.python_executable,
+            "-u",
+            WORKER_SCRIPT,
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            cwd=self.working_dir,
+            env=self.env,
+        )
+        worker = _Worker(process)
+        self._workers.add(worker)
+        return worker
+
+    async def _acquire(self) -> _Worker:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            if worker.alive:
+                return worker
+            self._spawned -= 1
+            self._workers.discard(worker)
+
+        async with self._spawn_lock:
+            if self._spawned < self.pool_size:
+                self._spawned += 1
+                try:
+                    return await self._spawn_worker()
+                except Exception:
+                    self._spawned -= 1
+                    raise
+
+        worker = await self._idle.get()
+        if worker.alive:
+            return worker
+        self._spawned -= 1
+        self._workers.discard(worker)
+        return await self._acquire()
+
+    def _release(self, worker: _Worker) -> None:
+        if worker.alive:
+            self._idle.put_nowait(worker)
+        else:
+            self._spawned -= 1
+            self._workers.discard(worker)
+
+    async def _discard(self, worker: _Worker) -> None:
+        self._workers.discard(worker)
+        await worker.kill()
+        self._spawned -= 1
+
+    async def execute(
+        self, code: str, timeout: int = 30, input_data: Any = None
+    ) -> Dict[str, Any]:
+        """Run code on an idle worker, matching execute_python_code's result shape.
+
+        ``input_data`` travels in the request frame and is exposed to the code
+        as the global ``_WORKER_INPUT`` rather than being interpolated into the
+        source, so compile cost does not scale with payload size.
+        """
+        message: Dict[str, Any] = {"code": code}
+        if input_data is not None:
+            message["input"] = input_data
+        return await self._dispatch(message, timeout)
+
+    async def execute_node(
+        self,
+        code: str,
+        inputs: list,
+        entrypoint: Optional[str] = None,
+        filename: Optional[str] = None,
+        timeout: int = 30,
+    ) -> Dict[str, Any]:
+        """Run a node's entrypoint once per input on an idle worker.
+
+        The worker compiles the node code (cached per source), calls the
+        entrypoint for each input, and returns per-input ``results`` in the
+        response — no wrapper source is built or parsed per request.
+        """
+        message: Dict[str, Any] = {
+            "mode": "node",
+            "code": code,
+            "input": inputs,
+        }
+        if entrypoint is not None:
+            message["entrypoint"] = entrypoint
+        if filename is not None:
+            message["filename"] = filename
+        return await self._dispatch(message, timeout)
+
+    async def execute_node_stream(
+        self,
+        code: str,
+        input_data: Any,
+        entrypoint: Optional[str] = None,
+        filename: Optional[str] = None,
+        timeout: int = 30,
+    ):
+        """Run one input and yield each frame the worker emits.
+
+        Yields ``{"chunk": ...}`` frames (one per generator item) followed by
+        a terminal ``{"done": True, ...}`` frame. ``timeout`` bounds the wait
+        for each individual frame, not the whole execution.
+        """
+        message: Dict[str, Any] = {
+            "mode": "node",
+            "stream": True,
+            "code": code,
+            "input": [input_data],
+        }
+        if entrypoint is not None:
+            message["entrypoint"] = entrypoint
+        if filename is not None:
+            message["filename"] = filename
+
+        try:
+            worker = await self._acquire()
+        except FileNotFoundError:
+            yield {
+                "done": True,
+                "output": "",
+                "error": f"Python 실행 파일을 찾을 수 없습니다: {self.python_executable}",
+                "exit_code": -1,
+            }
+            return
+
+        completed = False
+        try:
+            await worker.send(message)
+            while True:
+                frame = await asyncio.wait_for(worker.read(), timeout=timeout)
+                yield frame
+                if frame.get("done"):
+                    completed = True
+                    break
+        except asyncio.TimeoutError:
+            yield {
+                "done": True,
+                "output": "",
+                "error": "Code execution timed out",
+                "exit_code": -1,
+            }
+        except Exception as exc:
+            yield {
+                "done": True,
+                "output": "",
+                "error": str(exc),
+                "exit_code": -1,
+            }
+        finally:
+            # An abandoned or failed stream leaves the pipe in an unknown
+            # state, so the worker is only reusable after a clean done frame.
+            if completed:
+                self._release(worker)
+            else:
+                await self._discard(worker)
+
+    async def _dispatch(self, message: Dict[str, Any], timeout: int) -> Dict[str, Any]:
+        try:
+            worker = await self._acquire()
+        except FileNotFoundError:
+            return {
+                "output": "",
+                "error": f"Python 실행 파일을 찾을 수 없습니다: {self.python_executable}",
+                "exit_code": -1,
+            }
+
+        try:
+            result = await asyncio.wait_for(worker.request(message), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self._discard(worker)
+            return {
+                "output": "",
+                "error": "Code execution timed out",
+                "exit_code": -1,
+            }
+        except Exception as exc:
+            await self._discard(worker)
+            return {
+                "output": "",
+                "error": str(exc),
+                "exit_code": -1,
+            }
+
+        self._release(worker)
+        return result
+
+    async def shutdown(self) -> None:
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+            await worker.kill()
+        self._workers.clear()
+        self._spawned = 0
+
+    def kill_now(self) -> None:
+        """Synchronously terminate every worker, including checked-out ones.
+
+        Used from non-async paths (venv create/delete); a request holding a
+        killed worker sees a read failure and reports it as an error.
+        """
+        for worker in list(self._workers):
+            if worker.alive:
+                try:
+                    worker.process.kill()
+                except ProcessLookupError:
+                    pass
+        self._workers.clear()
+        self._spawned = 0
+        while True:
+            try:
+                self._idle.get_nowait()
+            except asyncio.QueueEmpty:
+                break
+
+
+def get_pool(
+    python_executable: str,
+    working_dir: str,
+    env: Optional[Dict[str, str]] = None,
+    pool_size: int = DEFAULT_POOL_SIZE,
+) -> WorkerPool:
+    """Return the shared pool for a (python executable, project path, env) config."""
+    key = (python_executable, working_dir, _env_key(env))
+    pool = _pools.get(key)
+    if pool is None:
+        pool = WorkerPool(python_executable, working_dir, env=env, pool_size=pool_size)
+        _pools[key] = pool
+    return pool
+
+
+def discard_pools(working_dir: str) -> None:
+    """Kill and drop every pool bound to a project path.
+
+    Called alongside venv create/delete: pooled workers otherwise keep
+    running against the removed interpreter and environment.
+    """
+    for key in [key for key in _pools if key[1] == working_dir]:
+        _pools.pop(key).kill_now()
+
+
+async def shutdown_all() -> None:
+    """Terminate every pooled worker (called on application shutdown)."""
+    for pool in list(_pools.values()):
+        await pool.shutdown()
+    _pools.clear()
@@ -3,10 +3,20 @@ from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import asyncio
 from app.api import health, code, project, components, packages, user_components
+from app.core import worker_pool
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Use uvloop's libuv-based event loop when available (optional dependency;
+# not available on Windows) - flow execution is asyncio-heavy
+try:
+    import uvloop
+
+    uvloop.install()
+except ImportError:
+    pass
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -18,6 +28,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down AIM Red Toolkit Backend")
+    await worker_pool.shutdown_all()
     logger.info("Shutdown complete")
 
 
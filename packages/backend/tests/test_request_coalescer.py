@@ -0,0 +1,59 @@
+import asyncio
+
+from app.core.request_coalescer import Coalescer
+
+
+def test_concurrent_submissions_share_one_runner_call():
+    calls = []
+
+    async def runner(items):
+        calls.append(items)
+        return [item * 2 for item in items]
+
+    async def scenario():
+        coalescer = Coalescer(window=0.02)
+        return await asyncio.gather(
+            coalescer.submit("key", 1, runner),
+            coalescer.submit("key", 2, runner),
+            coalescer.submit("key", 3, runner),
+        )
+
+    results = asyncio.run(scenario())
+    assert results == [2, 4, 6]
+    assert len(calls) == 1
+    assert calls[0] == [1, 2, 3]
+
+
+def test_different_keys_do_not_batch_together():
+    calls = []
+
+    async def runner(items):
+        calls.append(items)
+        return items
+
+    async def scenario():
+        coalescer = Coalescer(window=0.02)
+        return await asyncio.gather(
+            coalescer.submit("a", 1, runner),
+            coalescer.submit("b", 2, runner),
+        )
+
+    assert asyncio.run(scenario()) == [1, 2]
+    assert len(calls) == 2
+
+
+def test_runner_failure_propagates_to_all_waiters():
+    async def runner(items):
+        raise RuntimeError("worker died")
+
+    async def scenario():
+        coalescer = Coalescer(window=0.01)
+        results = await asyncio.gather(
+            coalescer.submit("key", 1, runner),
+            coalescer.submit("key", 2, runner),
+            return_exceptions=True,
+        )
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(r, RuntimeError) for r in results)
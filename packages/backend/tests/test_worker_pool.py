@@ -0,0 +1,107 @@
+import asyncio
+import sys
+
+from app.core import worker_pool
+
+
+def _run(scenario):
+    """Run an async scenario with a fresh single-worker pool, shutting it down in-loop."""
+
+    async def wrapper():
+        pool = worker_pool.WorkerPool(sys.executable, ".", pool_size=1)
+        try:
+            return await scenario(pool)
+        finally:
+            await pool.shutdown()
+
+    return asyncio.run(wrapper())
+
+
+def test_execute_captures_stdout():
+    async def scenario(pool):
+        return await pool.execute("print('hello')")
+
+    result = _run(scenario)
+    assert result["exit_code"] == 0
+    assert result["output"].strip() == "hello"
+    assert result["error"] is None
+
+
+def test_execute_reports_errors():
+    async def scenario(pool):
+        return await pool.execute("raise ValueError('boom')")
+
+    result = _run(scenario)
+    assert result["exit_code"] == 1
+    assert "ValueError: boom" in result["error"]
+
+
+def test_input_data_is_exposed_via_worker_input():
+    async def scenario(pool):
+        return await pool.execute(
+            "print(_WORKER_INPUT['value'] * 2)", input_data={"value": 21}
+        )
+
+    result = _run(scenario)
+    assert result["exit_code"] == 0
+    assert result["output"].strip() == "42"
+
+
+def test_execute_node_runs_entrypoint_per_input():
+    async def scenario(pool):
+        return await pool.execute_node(
+            "def main(input_data=None):\n    return (input_data or 0) + 1\n",
+            [1, 2, None],
+            entrypoint="main",
+        )
+
+    result = _run(scenario)
+    assert result["exit_code"] == 0
+    assert [r["output"] for r in result["results"]] == [2, 3, 1]
+
+
+def test_execute_node_reports_per_input_errors():
+    async def scenario(pool):
+        return await pool.execute_node(
+            "def main(input_data=None):\n    return 1 / input_data\n",
+            [1, 0],
+            entrypoint="main",
+        )
+
+    result = _run(scenario)
+    ok, failed = result["results"]
+    assert ok["success"] and ok["output"] == 1
+    assert not failed["success"]
+    assert "division" in failed["error"]
+
+
+def test_worker_is_reused_between_executions():
+    async def scenario(pool):
+        first = await pool.execute("import os; print(os.getpid())")
+        second = await pool.execute("import os; print(os.getpid())")
+        return first, second
+
+    first, second = _run(scenario)
+    assert first["output"] == second["output"]
+
+
+def test_timeout_replaces_worker():
+    async def scenario(pool):
+        timed_out = await pool.execute("import time; time.sleep(10)", timeout=1)
+        recovered = await pool.execute("print('ok')")
+        return timed_out, recovered
+
+    timed_out, recovered = _run(scenario)
+    assert timed_out["exit_code"] == -1
+    assert "timed out" in timed_out["error"]
+    assert recovered["output"].strip() == "ok"
+
+
+def test_get_pool_returns_shared_instance():
+    async def scenario():
+        first = worker_pool.get_pool(sys.executable, ".")
+        second = worker_pool.get_pool(sys.executable, ".")
+        assert first is second
+        await worker_pool.shutdown_all()
+
+    asyncio.run(scenario())